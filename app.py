@@ -13,7 +13,6 @@ import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 import plotly.io as pio
 try:
     from streamlit_plotly_events import plotly_events
@@ -459,10 +458,20 @@ def apply_time_series_hover_affordance(
 
 # 数据文件路径
 DATA_FILE = "主要ETF基金份额变动情况.xlsx"
-st.markdown(
-    f"<style>{build_global_apple_theme_css()}{build_author_tracker_apple_css()}</style>",
-    unsafe_allow_html=True,
-)
+
+
+@st.cache_data(show_spinner=False)
+def _global_theme_css_block() -> str:
+    """全局主题CSS只在进程内构建一次；token插值与图标data-URI编码开销不小"""
+    return f"<style>{build_global_apple_theme_css()}{build_author_tracker_apple_css()}</style>"
+
+
+@st.cache_data(show_spinner=False)
+def _terminal_overrides_css_block() -> str:
+    return f"<style>{build_terminal_component_overrides_css()}</style>"
+
+
+st.markdown(_global_theme_css_block(), unsafe_allow_html=True)
 
 
 HOTMONEY_SECTION_WRAPPER_CSS = """
@@ -2655,7 +2664,9 @@ def _sha256_file_cached(file_path: str, file_mtime: float, file_size: int) -> st
     return sha.hexdigest()
 
 
-@st.cache_data(show_spinner=False)
+# cache_resource直接共享DataFrame对象，省去cache_data每次命中的
+# 序列化/反序列化拷贝；下游只读不改，共享是安全的
+@st.cache_resource(show_spinner=False)
 def _load_etf_share_cache(cache_path: str, meta_path: str, expected_sha256: str) -> pd.DataFrame | None:
     import gzip
     import json
@@ -2679,6 +2690,82 @@ def _load_etf_share_cache(cache_path: str, meta_path: str, expected_sha256: str)
         return None
 
 
+@st.cache_resource(show_spinner=False)
+def _load_etf_parquet_cache(cache_path: str, meta_path: str, expected_sha256: str) -> pd.DataFrame | None:
+    import json
+    import os
+
+    if not os.path.exists(cache_path) or not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("excel_sha256") != expected_sha256:
+            return None
+        df = pd.read_parquet(cache_path)
+        if df is None or len(df) == 0:
+            return None
+        return df
+    except Exception:
+        return None
+
+
+def _store_etf_parquet_cache(cache_path: str, meta_path: str, df: pd.DataFrame, excel_sha256: str) -> None:
+    import json
+    import os
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        df.to_parquet(cache_path, compression="zstd")
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"excel_sha256": excel_sha256}, f)
+    except Exception as e:
+        logger.warning(f"写入ETF数据Parquet缓存失败: {e}")
+
+
+@st.cache_data(show_spinner=False)
+def build_metric_frames(df: pd.DataFrame) -> dict:
+    """按指标预切分DataFrame，rerun时以字典查找代替全表布尔扫描
+
+    每个子表按(name, date)稳定排序，下游图表/统计直接groupby即可，
+    不必在每次rerun时重新排序。
+    """
+    return {
+        str(metric): group.sort_values(['name', 'date'], kind='mergesort').reset_index(drop=True)
+        for metric, group in df.groupby('metric_type', sort=False, observed=True)
+    }
+
+
+@st.cache_data(show_spinner=False)
+def build_metric_meta(df: pd.DataFrame) -> dict:
+    """预计算每个指标的ETF名称列表与是否含汇总行
+
+    这些值是加载数据的纯函数，缓存后rerun中的侧边栏渲染
+    变成O(1)字典读取，而不是重复的unique()/any()扫描。
+    """
+    meta = {}
+    for metric, group in df.groupby('metric_type', sort=False, observed=True):
+        meta[str(metric)] = {
+            'names': sorted(group.loc[~group['is_aggregate'], 'name'].unique()),
+            'has_aggregate': bool(group['is_aggregate'].any()),
+            'min_date': group['date'].min().date(),
+            'max_date': group['date'].max().date(),
+        }
+    return meta
+
+
+@st.cache_data(show_spinner=False)
+def build_metric_categories_cached(metric_types: tuple) -> dict:
+    """build_metric_categories的缓存版：指标集合稳定，分类子串扫描只做一次"""
+    return build_metric_categories(metric_types)
+
+
+@st.cache_data(show_spinner=False)
+def build_quick_metric_groups_cached(metric_types: tuple) -> dict:
+    return build_quick_metric_groups(metric_types)
+
+
 def load_data(file_path: str) -> pd.DataFrame:
     try:
         import os
@@ -2692,9 +2779,17 @@ def load_data(file_path: str) -> pd.DataFrame:
         if cached_df is not None:
             return cached_df
 
+        # 进程重启后优先读Parquet缓存，跳过完整的Excel重新解析
+        parquet_path = os.path.join(base_dir, "data", "etf_share_cache.parquet")
+        parquet_meta_path = os.path.join(base_dir, "data", "etf_share_cache.parquet.meta.json")
+        cached_df = _load_etf_parquet_cache(parquet_path, parquet_meta_path, file_sha256)
+        if cached_df is not None:
+            return cached_df
+
         logger.info(f"Loading data from {file_path}")
         df = load_etf_data(file_path)
         logger.info(f"Data loaded successfully: {len(df)} rows")
+        _store_etf_parquet_cache(parquet_path, parquet_meta_path, df, file_sha256)
         return df
     except FileNotFoundError:
         st.error(f"❌ 文件未找到: {file_path}")
@@ -6899,12 +6994,126 @@ def draw_metric_card(title: str, value: str, delta: str, delta_pct: str = None)
     return card_html
 
 
+# 超过该点数/trace数后改用WebGL(Scattergl)渲染，避免SVG DOM成为浏览器瓶颈
+SCATTERGL_MIN_POINTS = 1000
+SCATTERGL_MIN_TRACES = 5
+# 单条trace超过该点数时先做LTTB降采样再发给前端
+LTTB_MAX_POINTS_PER_TRACE = 2000
+# 半透明背景ETF达到该数量后合并为一条NaN分隔的trace
+BACKGROUND_BATCH_MIN_ETFS = 10
+
+
+def lttb_downsample_indices(dates, values, n_out: int = LTTB_MAX_POINTS_PER_TRACE) -> np.ndarray:
+    """LTTB(Largest-Triangle-Three-Buckets)降采样，返回保留点的位置索引。
+
+    视觉无损地把长序列压到 n_out 个点：保留首尾点，中间按桶选取
+    与相邻桶构成三角形面积最大的点，从而保留峰谷形态。
+
+    Args:
+        dates: 升序日期序列（Series或datetime64数组）
+        values: 数值序列
+        n_out: 目标点数
+
+    Returns:
+        升序位置索引数组（np.ndarray[int]）
+    """
+    n = len(values)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(pd.to_datetime(pd.Series(dates)).values.astype('int64'), dtype='float64')
+    y = np.asarray(pd.Series(values).values, dtype='float64')
+
+    # 中间点分成 n_out-2 个桶，首尾点固定保留
+    bucket_edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    selected = np.empty(n_out, dtype='int64')
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev_idx = 0
+    for bucket in range(n_out - 2):
+        start, end = bucket_edges[bucket], bucket_edges[bucket + 1]
+        # 下一个桶的均值点作为三角形的第三个顶点
+        next_start, next_end = bucket_edges[bucket + 1], bucket_edges[min(bucket + 2, n_out - 2)]
+        if next_start >= next_end:
+            next_end = min(next_start + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bx = x[start:end]
+        by = y[start:end]
+        # 三角形面积（省略1/2系数，不影响argmax）
+        areas = np.abs(
+            (x[prev_idx] - avg_x) * (by - y[prev_idx]) -
+            (x[prev_idx] - bx) * (avg_y - y[prev_idx])
+        )
+        prev_idx = start + int(np.argmax(areas))
+        selected[bucket + 1] = prev_idx
+
+    return selected
+
+
+def _downsample_for_plot(etf_data: pd.DataFrame) -> pd.DataFrame:
+    """超长序列先降采样到 LTTB_MAX_POINTS_PER_TRACE 个点再绘制"""
+    if len(etf_data) <= LTTB_MAX_POINTS_PER_TRACE:
+        return etf_data
+    idx = lttb_downsample_indices(etf_data['date'], etf_data['value'])
+    return etf_data.iloc[idx]
+
+
+# 专业金融调色盘（模块级构建一次）
+LINE_CHART_COLOR_PALETTE = [
+    THEME_NAVY, THEME_ACCENT_ALT, "#C28C4E", "#5B8E7D", "#607D9B",
+    THEME_PRIMARY, "#6FA3B8", THEME_UP, "#8AA05A", THEME_ACCENT_ALT
+]
+
+# ETF折线图的静态布局模板；每次调用只补充标题/uirevision等动态字段，
+# 免去update_layout/update_xaxes/update_yaxes三次逐属性校验
+_LINE_CHART_LAYOUT_BASE = dict(
+    hovermode='x unified',
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=-0.25,
+        xanchor="center",
+        x=0.5,
+        bgcolor="rgba(255, 255, 255, 0)",
+        font=dict(size=MIN_FONT_SIZE)
+    ),
+    height=500,
+    template='plotly_white',
+    plot_bgcolor=CHART_BG,
+    paper_bgcolor=CHART_PAPER_BG,
+    font=dict(family=SYSTEM_FONT_FAMILY),
+    margin=dict(l=20, r=20, t=60, b=20),
+    xaxis=dict(
+        title=dict(text='日期'),
+        rangeslider=dict(visible=False),
+        showgrid=True,
+        gridwidth=1,
+        gridcolor=CHART_GRID_COLOR,
+        showline=True,
+        linewidth=1,
+        linecolor=CHART_AXIS_COLOR
+    ),
+    yaxis=dict(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor=CHART_GRID_COLOR,
+        showline=True,
+        linewidth=1,
+        linecolor=CHART_AXIS_COLOR,
+        fixedrange=True
+    ),
+)
+
+
 def create_line_chart(filtered_df: pd.DataFrame, metric_name: str, is_aggregate: bool, selected_etfs: list = None, chart_type: str = 'line') -> go.Figure:
     """
     创建Plotly折线图
 
     Args:
-        filtered_df: 筛选后的DataFrame
+        filtered_df: 筛选后的DataFrame（每个name内需按date升序，build_metric_frames已保证）
         metric_name: 指标名称
         is_aggregate: 是否显示汇总数据
         selected_etfs: 选中的ETF列表（非汇总模式）
@@ -6913,131 +7122,201 @@ def create_line_chart(filtered_df: pd.DataFrame, metric_name: str, is_aggregate:
     Returns:
         Plotly Figure对象
     """
-    # 专业金融调色盘
-    color_palette = [
-        THEME_NAVY, THEME_ACCENT_ALT, "#C28C4E", "#5B8E7D", "#607D9B",
-        THEME_PRIMARY, "#6FA3B8", THEME_UP, "#8AA05A", THEME_ACCENT_ALT
-    ]
+    color_palette = LINE_CHART_COLOR_PALETTE
 
-    fig = go.Figure()
+    # 大数据量/多ETF时改用WebGL渲染（单个canvas），小数据量保持SVG以保留spline平滑
+    use_webgl = (not is_aggregate) and (
+        len(filtered_df) >= SCATTERGL_MIN_POINTS or
+        (selected_etfs is not None and len(selected_etfs) > SCATTERGL_MIN_TRACES)
+    )
+    trace_type = 'scattergl' if use_webgl else 'scatter'
+
+    # 先收集全部trace dict，最后一次性构造Figure；
+    # 相比逐个实例化go.Scatter，省掉每条trace的schema遍历校验
+    traces = []
 
     if is_aggregate:
         # 单条线显示汇总数据
-        agg_data = filtered_df[filtered_df['is_aggregate'] == True].sort_values('date')
+        # is_aggregate在加载时已压成bool，直接作掩码用，免去逐行==比较；
+        # build_metric_frames已按name/date排序，掩码筛选保持日期升序，无需再排
+        agg_data = filtered_df[filtered_df['is_aggregate']]
+        agg_data = _downsample_for_plot(agg_data)
         if len(agg_data) > 0:
+            agg_trace = dict(
+                type='scatter',
+                x=agg_data['date'],
+                y=agg_data['value'],
+                mode='lines',
+                name='所有ETF总和',
+                line=dict(width=3, shape='spline', color=color_palette[0]),
+                hovertemplate='<b>%{x|%Y-%m-%d}</b><br>%{y:.2f}<extra></extra>'
+            )
             if chart_type == 'area':
-                fig.add_trace(go.Scatter(
-                    x=agg_data['date'],
-                    y=agg_data['value'],
-                    mode='lines',
-                    name='所有ETF总和',
-                    fill='tozeroy',
-                    line=dict(width=3, shape='spline', color=color_palette[0]),
-                    fillcolor=CHART_NAVY_SOFT_FILL,
-                    hovertemplate='<b>%{x|%Y-%m-%d}</b><br>%{y:.2f}<extra></extra>'
-                ))
-            else:
-                fig.add_trace(go.Scatter(
-                    x=agg_data['date'],
-                    y=agg_data['value'],
-                    mode='lines',
-                    name='所有ETF总和',
-                    line=dict(width=3, shape='spline', color=color_palette[0]),
-                    hovertemplate='<b>%{x|%Y-%m-%d}</b><br>%{y:.2f}<extra></extra>'
-                ))
+                agg_trace['fill'] = 'tozeroy'
+                agg_trace['fillcolor'] = CHART_NAVY_SOFT_FILL
+            traces.append(agg_trace)
     else:
         # 多条线显示各个ETF
         if selected_etfs:
+            # groupby分组（子表已按name/date预排序），避免每个ETF都全表扫描+排序
+            etf_groups = {
+                name: group
+                for name, group in filtered_df.groupby('name', sort=False, observed=True)
+            }
+            # 半透明的背景ETF数量很多时，用NaN分隔符合并成一条trace，
+            # 浏览器端一次绘制代替N条trace的逐条setup（仅line模式）
+            batch_background = (
+                chart_type == 'line' and
+                len(selected_etfs) - 3 >= BACKGROUND_BATCH_MIN_ETFS
+            )
+            if batch_background:
+                batch_x, batch_y, batch_names = [], [], []
+                batch_count = 0
+                for etf_name in selected_etfs[3:]:
+                    etf_data = etf_groups.get(etf_name)
+                    if etf_data is None or len(etf_data) == 0:
+                        continue
+                    etf_data = _downsample_for_plot(etf_data)
+                    if use_webgl:
+                        batch_x.extend(etf_data['date'].dt.strftime('%Y-%m-%d').tolist())
+                    else:
+                        batch_x.extend(etf_data['date'].tolist())
+                    batch_y.extend(etf_data['value'].tolist())
+                    batch_names.extend([etf_name] * len(etf_data))
+                    # None分隔符断开相邻ETF的折线
+                    batch_x.append(None)
+                    batch_y.append(None)
+                    batch_names.append('')
+                    batch_count += 1
+
+                if batch_count:
+                    traces.append(dict(
+                        type=trace_type,
+                        x=batch_x,
+                        y=batch_y,
+                        mode='lines',
+                        name=f'其他ETF（{batch_count}只）',
+                        line=dict(width=1.5, color='#9AA4B2'),
+                        opacity=0.3,
+                        customdata=batch_names,
+                        hovertemplate='<b>%{customdata}</b><br>%{x|%Y-%m-%d}<br>%{y:.4f}<extra></extra>'
+                    ))
+
             # 前3个ETF高亮显示，其余半透明
             for idx, etf_name in enumerate(selected_etfs):
-                etf_data = filtered_df[filtered_df['name'] == etf_name].sort_values('date')
+                if batch_background and idx >= 3:
+                    continue
+                etf_data = etf_groups.get(etf_name)
+                if etf_data is None:
+                    continue
+                etf_data = _downsample_for_plot(etf_data)
                 if len(etf_data) > 0:
                     color = color_palette[idx % len(color_palette)]
                     opacity = 1.0 if idx < 3 else 0.3
                     line_width = 2.5 if idx < 3 else 1.5
 
+                    if use_webgl:
+                        # WebGL路径：传ISO日期字符串+Python list，绕开plotly.js
+                        # typed-array清理与date-axis fancy-renderer慢路径
+                        x_vals = etf_data['date'].dt.strftime('%Y-%m-%d').tolist()
+                        y_vals = etf_data['value'].tolist()
+                        # Scattergl不支持spline
+                        line_style = dict(width=line_width, color=color)
+                    else:
+                        x_vals = etf_data['date']
+                        y_vals = etf_data['value']
+                        line_style = dict(width=line_width, shape='spline', color=color)
+
                     if chart_type == 'area':
-                        fig.add_trace(go.Scatter(
-                            x=etf_data['date'],
-                            y=etf_data['value'],
+                        traces.append(dict(
+                            type=trace_type,
+                            x=x_vals,
+                            y=y_vals,
                             mode='lines',
                             name=etf_name,
                             fill='tonexty',
-                            line=dict(width=line_width, shape='spline', color=color),
+                            line=line_style,
                             opacity=opacity,
                             hovertemplate=f'<b>{etf_name}</b><br>%{{x|%Y-%m-%d}}<br>%{{y:.4f}}<extra></extra>'
                         ))
                     elif chart_type == 'scatter':
-                        fig.add_trace(go.Scatter(
-                            x=etf_data['date'],
-                            y=etf_data['value'],
+                        traces.append(dict(
+                            type=trace_type,
+                            x=x_vals,
+                            y=y_vals,
                             mode='markers',
                             name=etf_name,
                             marker=dict(size=8, opacity=opacity, color=color),
                             hovertemplate=f'<b>{etf_name}</b><br>%{{x|%Y-%m-%d}}<br>%{{y:.4f}}<extra></extra>'
                         ))
                     else:  # line
-                        fig.add_trace(go.Scatter(
-                            x=etf_data['date'],
-                            y=etf_data['value'],
+                        traces.append(dict(
+                            type=trace_type,
+                            x=x_vals,
+                            y=y_vals,
                             mode='lines',
                             name=etf_name,
-                            line=dict(width=line_width, shape='spline', color=color),
+                            line=line_style,
                             opacity=opacity,
                             hovertemplate=f'<b>{etf_name}</b><br>%{{x|%Y-%m-%d}}<br>%{{y:.4f}}<extra></extra>'
                         ))
 
-    # 布局配置 - 响应式设计
-    fig.update_layout(
+    # 静态布局模板 + 本次调用的动态字段，一次性构造Figure
+    layout = dict(
+        _LINE_CHART_LAYOUT_BASE,
         title=dict(
             text=f'{metric_name} 变动趋势',
             font=dict(size=20, weight=700, color=THEME_TEXT),
             x=0.02
         ),
-        xaxis_title='日期',
-        yaxis_title=metric_name,
-        hovermode='x unified',
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.25,
-            xanchor="center",
-            x=0.5,
-            bgcolor="rgba(255, 255, 255, 0)",
-            font=dict(size=MIN_FONT_SIZE)
-        ),
-        height=500,
-        template='plotly_white',
-        plot_bgcolor=CHART_BG,
-        paper_bgcolor=CHART_PAPER_BG,
-        font=dict(family=SYSTEM_FONT_FAMILY),
-        margin=dict(l=20, r=20, t=60, b=20)
+        yaxis=dict(_LINE_CHART_LAYOUT_BASE['yaxis'], title=dict(text=metric_name)),
+        # 同一指标下rerun时plotly.js原地更新并保留缩放/平移状态，
+        # 而不是整图重建
+        uirevision=metric_name,
     )
+    fig = go.Figure(data=traces, layout=layout)
     if fig.data:
         apply_time_series_hover_affordance(fig, filtered_df['date'], filtered_df['value'])
 
-    # 网格线样式
-    fig.update_xaxes(
-        rangeslider_visible=False,
-        showgrid=True,
-        gridwidth=1,
-        gridcolor=CHART_GRID_COLOR,
-        showline=True,
-        linewidth=1,
-        linecolor=CHART_AXIS_COLOR
-    )
+    return fig
 
-    fig.update_yaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor=CHART_GRID_COLOR,
-        showline=True,
-        linewidth=1,
-        linecolor=CHART_AXIS_COLOR,
-        fixedrange=True
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def build_line_chart_cached(filtered_df: pd.DataFrame, metric_name: str, is_aggregate: bool,
+                            selected_etfs: Optional[tuple], chart_type: str) -> go.Figure:
+    """create_line_chart的缓存包装：同一筛选组合的rerun直接复用已构建的Figure
+
+    缓存键包含filtered_df内容，底层数据刷新后自动失效；
+    selected_etfs需传tuple以保证可哈希。
+    """
+    return create_line_chart(
+        filtered_df, metric_name, is_aggregate,
+        list(selected_etfs) if selected_etfs is not None else None,
+        chart_type
     )
 
-    return fig
+
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+# 行数低于该阈值时JIT预热成本高于收益，仍走pandas路径
+NUMBA_STATS_MIN_ROWS = 50_000
+
+if njit is not None:
+    @njit(cache=True)
+    def _last_prev_reduce(codes, values, n_groups):
+        """单趟扫描（按组内日期升序）求每组最后值/倒数第二个值及末行位置"""
+        last = np.full(n_groups, np.nan)
+        prev = np.full(n_groups, np.nan)
+        last_pos = np.zeros(n_groups, dtype=np.int64)
+        for i in range(codes.shape[0]):
+            c = codes[i]
+            prev[c] = last[c]
+            last[c] = values[i]
+            last_pos[c] = i
+        return last, prev, last_pos
 
 
 def calculate_statistics(filtered_df: pd.DataFrame, is_aggregate: bool, selected_etfs: list = None) -> pd.DataFrame:
@@ -7045,7 +7324,7 @@ def calculate_statistics(filtered_df: pd.DataFrame, is_aggregate: bool, selected
     计算统计信息 - 显示最新日期和前一天的数据对比
 
     Args:
-        filtered_df: 筛选后的DataFrame
+        filtered_df: 筛选后的DataFrame（每个name内需按date升序，build_metric_frames已保证）
         is_aggregate: 是否为汇总数据
         selected_etfs: 选中的ETF列表（非汇总模式）
 
@@ -7056,7 +7335,8 @@ def calculate_statistics(filtered_df: pd.DataFrame, is_aggregate: bool, selected
 
     if is_aggregate:
         # 计算汇总数据的统计信息
-        agg_data = filtered_df[filtered_df['is_aggregate'] == True].sort_values('date')
+        # 日期升序由build_metric_frames的预排序保证
+        agg_data = filtered_df[filtered_df['is_aggregate']]
         if len(agg_data) >= 2:
             # 获取最新日期和前一天的数据
             latest_date = agg_data.iloc[-1]['date']
@@ -7090,46 +7370,60 @@ def calculate_statistics(filtered_df: pd.DataFrame, is_aggregate: bool, selected
     else:
         # 计算各个ETF的统计信息
         if selected_etfs:
-            for etf_name in selected_etfs:
-                etf_data = filtered_df[filtered_df['name'] == etf_name].sort_values('date')
-
-                if len(etf_data) == 0:
-                    continue
+            if njit is not None and len(filtered_df) > NUMBA_STATS_MIN_ROWS:
+                # 大数据量时用numba内核单趟融合归约，绕开pandas分组开销
+                group_codes, uniques = pd.factorize(filtered_df['name'])
+                last_values, prev_values_arr, last_pos = _last_prev_reduce(
+                    group_codes.astype(np.int64),
+                    filtered_df['value'].to_numpy(dtype=np.float64),
+                    len(uniques),
+                )
+                latest = pd.DataFrame({
+                    'date': filtered_df['date'].to_numpy()[last_pos],
+                    'value': last_values,
+                    'prev_value': prev_values_arr,
+                }, index=uniques).reindex(selected_etfs)
+            else:
+                # 向量化取每组最后两行（tail/shift都在C层完成），
+                # 避免每个ETF做一次切片+排序+iloc的Python循环；
+                # 子表在build_metric_frames中已按(name, date)预排序
+                last2 = filtered_df.groupby('name', sort=False, observed=True).tail(2).copy()
+                last2['prev_value'] = last2.groupby('name', sort=False, observed=True)['value'].shift(1)
+                latest = (
+                    last2.groupby('name', sort=False, observed=True)
+                    .tail(1)
+                    .set_index('name')
+                    .reindex(selected_etfs)
+                )
+            latest = latest[latest['value'].notna()]
+
+            # 数值与格式化都整列完成，不再逐行拼f-string
+            values = latest['value'].to_numpy(dtype=float)
+            prev_values = latest['prev_value'].to_numpy(dtype=float)
+            has_prev = ~np.isnan(prev_values)
+            change = values - prev_values
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change_pct = np.where(prev_values != 0, change / prev_values * 100, 0.0)
+
+            # 根据数值大小确定小数位数
+            two_decimals = values > 100
+
+            def _format_by_decimals(arr: np.ndarray, sign: str = '') -> np.ndarray:
+                series = pd.Series(arr)
+                return np.where(
+                    two_decimals,
+                    series.map(('{:' + sign + '.2f}').format),
+                    series.map(('{:' + sign + '.4f}').format),
+                )
 
-                # 根据数值大小确定小数位数
-                sample_value = etf_data.iloc[-1]['value']
-                decimals = 2 if sample_value > 100 else 4
-
-                if len(etf_data) >= 2:
-                    # 获取最新日期和前一天的数据
-                    latest_date = etf_data.iloc[-1]['date']
-                    latest_value = etf_data.iloc[-1]['value']
-                    prev_value = etf_data.iloc[-2]['value']
-
-                    change = latest_value - prev_value
-                    change_pct = (change / prev_value * 100) if prev_value != 0 else 0
-
-                    stats_list.append({
-                        'ETF名称': etf_name,
-                        '最新日期': latest_date.strftime('%Y-%m-%d'),
-                        '当日数据': f'{latest_value:.{decimals}f}',
-                        '前日数据': f'{prev_value:.{decimals}f}',
-                        '变动': f'{change:+.{decimals}f}',
-                        '变动幅度': f'{change_pct:+.2f}%'
-                    })
-                else:
-                    # 只有一天的数据
-                    latest_date = etf_data.iloc[-1]['date']
-                    latest_value = etf_data.iloc[-1]['value']
-
-                    stats_list.append({
-                        'ETF名称': etf_name,
-                        '最新日期': latest_date.strftime('%Y-%m-%d'),
-                        '当日数据': f'{latest_value:.{decimals}f}',
-                        '前日数据': '-',
-                        '变动': '-',
-                        '变动幅度': '-'
-                    })
+            return pd.DataFrame({
+                'ETF名称': latest.index.to_numpy(),
+                '最新日期': latest['date'].dt.strftime('%Y-%m-%d').to_numpy(),
+                '当日数据': _format_by_decimals(values),
+                '前日数据': np.where(has_prev, _format_by_decimals(prev_values), '-'),
+                '变动': np.where(has_prev, _format_by_decimals(change, sign='+'), '-'),
+                '变动幅度': np.where(has_prev, pd.Series(change_pct).map('{:+.2f}%'.format), '-'),
+            })
 
     return pd.DataFrame(stats_list)
 
@@ -7838,10 +8132,7 @@ def _render_application_page() -> PageStatus:
 
     # Local dashboard modules inject their own CSS while rendering. This final
     # pass keeps those modules aligned with the shared terminal design system.
-    st.markdown(
-        f"<style>{build_terminal_component_overrides_css()}</style>",
-        unsafe_allow_html=True,
-    )
+    st.markdown(_terminal_overrides_css_block(), unsafe_allow_html=True)
 
     return page_status
 
@@ -9782,6 +10073,8 @@ def _build_factor_workbench_result_display_df(result_df: pd.DataFrame) -> pd.Dat
 
 
 def render_factor_workbench_tab():
+    import plotly.express as px
+
     st.subheader(FACTOR_WORKBENCH_PAGE_LABEL)
     st.caption("以日度特征表为锚点，先做硬条件初筛，再做多因子加权打分，输出每日盘后候选池。")
 
@@ -10805,6 +11098,13 @@ def render_company_screener_tab():
                             st.rerun()
 
 
+@st.cache_data(show_spinner=False)
+def _load_update_info(mtime: float) -> dict:
+    """读取last_update.json；以文件mtime入缓存键，文件变化时自动失效"""
+    with open('last_update.json', 'r') as f:
+        return json.load(f)
+
+
 def render_etf_tab():
     """渲染ETF份额变动Tab页内容"""
     # 加载数据
@@ -10817,18 +11117,14 @@ def render_etf_tab():
 
     # 根据GitHub Action更新日期过滤数据
     try:
-        import json
-        import os
-        from datetime import datetime
         if os.path.exists('last_update.json'):
-            with open('last_update.json', 'r') as f:
-                update_info = json.load(f)
-                update_date_str = update_info.get('update_date')
-                if update_date_str:
-                    update_date = datetime.strptime(update_date_str, '%Y-%m-%d')
-                    # 只保留更新日期及之前的数据
-                    df = df[df['date'] <= update_date]
-                    logger.info(f"数据已过滤至GitHub Action更新日期: {update_date_str}")
+            update_info = _load_update_info(os.path.getmtime('last_update.json'))
+            update_date_str = update_info.get('update_date')
+            if update_date_str:
+                update_date = datetime.strptime(update_date_str, '%Y-%m-%d')
+                # 只保留更新日期及之前的数据
+                df = df[df['date'] <= update_date]
+                logger.info(f"数据已过滤至GitHub Action更新日期: {update_date_str}")
     except Exception as e:
         logger.warning(f"无法读取last_update.json，使用所有数据: {e}")
 
@@ -10839,14 +11135,16 @@ def render_etf_tab():
         st.success(f"✅ 已加载 {len(df)} 条数据记录")
 
     # 1. 指标选择器
-    metric_types = sorted(df['metric_type'].unique())
+    metric_frames = build_metric_frames(df)
+    metric_meta = build_metric_meta(df)
+    metric_types = sorted(metric_frames)
 
     if len(metric_types) == 0:
         st.error("❌ 未检测到任何指标数据，请检查Excel文件格式")
         st.info("Excel文件应包含section标题行，标题中应包含关键词：市值、份额、变动、申赎、比例、涨跌幅")
         st.stop()
 
-    metric_categories = build_metric_categories(metric_types)
+    metric_categories = build_metric_categories_cached(tuple(metric_types))
 
     def resolve_metric_category(metric_name: str | None) -> str:
         for category_name, metrics in metric_categories.items():
@@ -10874,11 +11172,7 @@ def render_etf_tab():
                 key="iphone_etf_selected_metric"
             )
 
-            quick_metrics = {
-                "总市值": [m for m in metric_types if "总市值" in m],
-                "份额": [m for m in metric_types if "份额" in m and "总市值" not in m],
-                "涨跌幅": [m for m in metric_types if "涨跌" in m]
-            }
+            quick_metrics = build_quick_metric_groups_cached(tuple(metric_types))
             q1, q2, q3 = st.columns(3)
             if quick_metrics["总市值"] and q1.button("总市值", use_container_width=True, key="iphone_quick_market"):
                 selected_metric = quick_metrics["总市值"][0]
@@ -10887,15 +11181,15 @@ def render_etf_tab():
             if quick_metrics["涨跌幅"] and q3.button("涨跌幅", use_container_width=True, key="iphone_quick_change"):
                 selected_metric = quick_metrics["涨跌幅"][0]
 
-            metric_df = df[df['metric_type'] == selected_metric].copy()
-            has_aggregate = metric_df['is_aggregate'].any()
+            metric_df = metric_frames[selected_metric]
+            has_aggregate = metric_meta[selected_metric]['has_aggregate']
             contains_total_market_value = '总市值' in selected_metric if selected_metric else False
 
             if has_aggregate and contains_total_market_value:
                 st.info("📊 当前显示所有ETF的总和")
                 selected_etfs = None
             else:
-                etf_names = sorted(metric_df[metric_df['is_aggregate'] == False]['name'].unique())
+                etf_names = metric_meta[selected_metric]['names']
                 selected_etfs = st.multiselect(
                     "选择ETF",
                     options=etf_names,
@@ -10903,8 +11197,9 @@ def render_etf_tab():
                     key="iphone_etf_selected_etfs"
                 )
 
-            min_date = metric_df['date'].min().date()
-            max_date = metric_df['date'].max().date()
+            # 日期边界读缓存元数据，省去每次rerun的两次整列归约
+            min_date = metric_meta[selected_metric]['min_date']
+            max_date = metric_meta[selected_metric]['max_date']
             if min_date == max_date:
                 st.info(f"📅 当前数据日期: {min_date}")
                 date_range = (min_date, max_date)
@@ -10928,7 +11223,7 @@ def render_etf_tab():
     else:
         st.success(f"✅ 已加载 {len(df)} 条数据记录")
 
-        quick_metric_groups = build_quick_metric_groups(metric_types)
+        quick_metric_groups = build_quick_metric_groups_cached(tuple(metric_types))
         category_options = list(metric_categories.keys())
         chart_options = ['line', 'area', 'scatter']
         pending_metric = st.session_state.pop("etf_pending_metric", None)
@@ -11003,8 +11298,8 @@ def render_etf_tab():
                     st.session_state["etf_pending_metric_category"] = resolve_metric_category(target_metric)
                     st.rerun()
 
-            metric_df = df[df['metric_type'] == selected_metric].copy()
-            has_aggregate = metric_df['is_aggregate'].any()
+            metric_df = metric_frames[selected_metric]
+            has_aggregate = metric_meta[selected_metric]['has_aggregate']
             contains_total_market_value = '总市值' in selected_metric if selected_metric else False
 
             with st.expander("更多筛选", expanded=False):
@@ -11012,7 +11307,7 @@ def render_etf_tab():
                     st.info("📊 当前显示所有ETF的总和")
                     selected_etfs = None
                 else:
-                    etf_names = sorted(metric_df[metric_df['is_aggregate'] == False]['name'].unique())
+                    etf_names = metric_meta[selected_metric]['names']
                     current_selected_etfs = st.session_state.get("etf_selected_etfs")
                     if not isinstance(current_selected_etfs, list):
                         current_selected_etfs = etf_names
@@ -11027,8 +11322,8 @@ def render_etf_tab():
                         key="etf_selected_etfs"
                     )
 
-                min_date = metric_df['date'].min().date()
-                max_date = metric_df['date'].max().date()
+                min_date = metric_meta[selected_metric]['min_date']
+                max_date = metric_meta[selected_metric]['max_date']
 
                 if min_date == max_date:
                     st.info(f"📅 当前数据日期: {min_date}")
@@ -11053,10 +11348,14 @@ def render_etf_tab():
 
     # 主区域 - 图表和统计信息
     # 筛选数据
+    # 直接在datetime64域内比较，避免.dt.date逐行构造Python date对象
+    range_lo = pd.Timestamp(date_range[0])
+    range_hi = pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)
+    # 只读视图即可，下游图表/统计不修改filtered_df，省掉一次整列memcpy
     filtered_df = metric_df[
-        (metric_df['date'].dt.date >= date_range[0]) &
-        (metric_df['date'].dt.date <= date_range[1])
-    ].copy()
+        (metric_df['date'] >= range_lo) &
+        (metric_df['date'] < range_hi)
+    ]
 
     # 检查是否有数据
     if len(filtered_df) == 0:
@@ -11071,8 +11370,12 @@ def render_etf_tab():
         st.info("ℹ️ 请至少选择一个ETF")
         return
 
-    # 创建并显示图表
-    fig = create_line_chart(filtered_df, selected_metric, is_aggregate, selected_etfs, chart_type)
+    # 创建并显示图表（相同筛选组合命中缓存，只切换chart_type等控件时不重建）
+    fig = build_line_chart_cached(
+        filtered_df, selected_metric, is_aggregate,
+        tuple(selected_etfs) if selected_etfs is not None else None,
+        chart_type
+    )
 
     # 在图表之前显示关键指标卡片
     st.subheader("📊 关键指标")
@@ -16512,6 +16815,8 @@ def render_macro_tab():
 
 
 def render_etf_deposit_tab():
+    import plotly.express as px
+
     st.subheader("🏦 本外币存款")
     st.caption("展示本外币存款月度余额与增量变化，支持手工录入与 Excel 批量导入。")
 
@@ -16988,6 +17293,8 @@ def _collect_index_batch_rows(editor_df: pd.DataFrame, month_text: str) -> list[
 
 
 def render_index_monitor_tab():
+    import plotly.express as px
+
     st.subheader("📊 指数监测")
     st.caption("展示股票指数月度表现、估值趋势与同比环比变化，支持手工录入与 Excel 批量导入。")
 
@@ -17383,6 +17690,8 @@ def create_fund_monitor_chart(
     area: bool = False,
     line_dash: Optional[str] = None,
 ) -> go.Figure:
+    import plotly.express as px
+
     chart_options = {
         "data_frame": data_frame,
         "x": "month",
@@ -19917,6 +20226,8 @@ def render_fund_hot_stocks_tab():
             st.info("该基金在所选报告期暂无可用持仓数据。")
 def render_moneyflow_tab():
     """渲染资金流向 Tab 页"""
+    import plotly.express as px
+
     from src.moneyflow_fetcher import (
         query_moneyflow_daily_top,
         query_moneyflow_stock_history,
@@ -1,5 +1,6 @@
 """ETF数据自动更新主程序"""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 import argparse
@@ -15,18 +16,48 @@ from src.data_sources.tushare_source import TushareSource
 from src.exceptions import DataFetchError, ExcelUpdateError
 from src.utils import setup_logging, ExecutionReport
 
+# 并发抓取的线程数；抓取是HTTP I/O密集型，适度并发即可，
+# 太高容易触发数据源限流
+FETCH_MAX_WORKERS = 8
+
+# 已解析配置缓存: {路径: ((mtime, size), 配置dict)}
+# 批量回补等场景下main()会被反复调用，文件未变时直接复用解析结果；
+# 下游只读配置，返回缓存引用即可
+_CONFIG_CACHE = {}
+
+
+def _load_yaml_cached(path: str) -> dict:
+    """读取并解析YAML配置，按文件mtime+size缓存解析结果"""
+    import os
+    import yaml
+
+    # 优先用libyaml的C实现加速解析，环境没装时回退纯Python
+    try:
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
+
+    stat = os.stat(path)
+    key = (stat.st_mtime, stat.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=YamlLoader)
+    _CONFIG_CACHE[path] = (key, config)
+    return config
+
 
 def load_data_sources() -> List[ETFDataSource]:
     """加载并初始化数据源"""
-    import yaml
     import os
 
     logger = logging.getLogger('etf_updater')
 
     # 读取配置文件
     try:
-        with open('config.yaml', 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _load_yaml_cached('config.yaml')
     except Exception as e:
         # 如果配置文件读取失败，使用默认配置
         logger.warning(f"无法读取配置文件，使用默认AkShare数据源: {e}")
@@ -120,27 +151,51 @@ def main(target_date: str = None) -> int:
         etf_codes = excel_manager.get_etf_codes()
         logger.info(f"发现 {len(etf_codes)} 个ETF需要更新")
 
-        # 5. 逐个更新ETF
+        # 5. 并发抓取各ETF数据（纯HTTP I/O，互不依赖）；
+        #    Excel写入仍保持串行，openpyxl/xlwings都不是线程安全的
+        logger.info(f"并发获取 {len(etf_codes)} 个ETF的数据...")
+        with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as executor:
+            fetch_futures = {
+                code: executor.submit(source_manager.fetch_data, code, date)
+                for code in etf_codes
+            }
+
+        # 6. 按原顺序逐个处理抓取结果
+        # 支持整块写入的管理器（xlwings）先收集数据、循环结束后一次批量
+        # 写入，COM往返次数与ETF数量解耦；openpyxl管理器仍逐个写入
+        use_batch_update = hasattr(excel_manager, 'batch_update')
+        pending_updates = []
+
+        # 批量模式下日期列要先建好：get_previous_day_data按目标日期列
+        # 定位前一列，逐个写入时首次update_data就会建列，批量写入
+        # 挪到循环之后，这里补上（结果有缓存，batch_update直接复用）
+        if use_batch_update:
+            excel_manager.find_or_create_date_column(date)
+
         for idx, code in enumerate(etf_codes, 1):
             try:
-                logger.info(f"[{idx}/{len(etf_codes)}] 正在获取 {code} 的数据...")
+                logger.info(f"[{idx}/{len(etf_codes)}] 正在处理 {code} 的数据...")
 
                 # 获取ETF名称
                 etf_name = excel_manager.get_etf_name(code)
 
-                # 获取数据
-                data = source_manager.fetch_data(code, date)
+                # 取并发抓取结果（失败会在此抛出原始异常）
+                data = fetch_futures[code].result()
 
                 # 获取前一天的数据
                 prev_data = excel_manager.get_previous_day_data(code, date)
 
-                # 更新Excel
-                excel_manager.update_data(
-                    code=code,
-                    date=date,
-                    market_value=data['market_value'],
-                    unit_price=data['unit_price']
-                )
+                # 更新Excel（批量模式下先收集，循环后整块写入）
+                if use_batch_update:
+                    pending_updates.append(
+                        (code, data['market_value'], data['unit_price']))
+                else:
+                    excel_manager.update_data(
+                        code=code,
+                        date=date,
+                        market_value=data['market_value'],
+                        unit_price=data['unit_price']
+                    )
 
                 # 记录成功，包含详细信息
                 report.add_success(
@@ -163,7 +218,12 @@ def main(target_date: str = None) -> int:
                 logger.exception(f"✗ {code} 更新时发生异常")
                 continue
 
-        # 6. 先重算派生指标，再保存Excel并关闭
+        # 7. 批量写入收集到的数据（仅xlwings路径）
+        if use_batch_update and pending_updates:
+            logger.info(f"批量写入 {len(pending_updates)} 个ETF的数据...")
+            excel_manager.batch_update(date, pending_updates)
+
+        # 8. 先重算派生指标，再保存Excel并关闭
         logger.info("正在保存Excel文件...")
         if hasattr(excel_manager, "recalculate_formulas"):
             logger.info("正在重算ETF派生指标...")
@@ -176,7 +236,7 @@ def main(target_date: str = None) -> int:
             # xlwings会完美保留所有Excel格式和公式
             logger.info("✓ 使用xlwings保存，所有Excel格式和公式已完整保留")
 
-        # 7. 打印报告
+        # 9. 打印报告
         report.print_summary()
 
         return 0 if not report.failed_etfs else 1
@@ -1,11 +1,22 @@
 """Excel数据加载器 - 将Excel数据转换为长格式DataFrame"""
 
+import ast
+import operator
+import re
+import string
+
+import numpy as np
 import openpyxl
 import pandas as pd
-from datetime import datetime
-from typing import Dict, List, Tuple
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # 环境缺少calamine时回退openpyxl
+    CalamineWorkbook = None
+
 
 # 常量定义 - 与excel_manager.py保持一致
 CODE_COL = 1
@@ -13,6 +24,64 @@ NAME_COL = 2
 DATA_START_COL = 3
 GLOBAL_DATE_ROW = 2  # 全局日期行，所有section共享同一个日期行
 
+# 公式解析用的正则，模块级预编译（每个公式单元格都会用到，
+# 避免重复编译开销）
+_CELL_REF_RE = re.compile(r'([A-Z]+)(\d+)')
+# section header关键词，单次正则扫描替代逐关键词substring查找
+_SECTION_KW_RE = re.compile('市值|份额|变动|申赎|比例|涨跌幅')
+# 汇总行关键词（每个数据行都要判断一次）
+_AGGREGATE_KW_RE = re.compile('总计|合计|总和')
+_SUM_RE = re.compile(r'SUM\(([A-Z]+)(\d+):([A-Z]+)(\d+)\)', re.IGNORECASE)
+
+# 列字母→列号查找表；公式求值里每个单元格引用都要解析列号，
+# 查表替代openpyxl的逐字符base-26解码。多字母列首次出现时懒加载进表
+_COL_IDX = {letter: i + 1 for i, letter in enumerate(string.ascii_uppercase)}
+
+
+def _col_letter_to_index(letters: str) -> int:
+    """列字母转1-based列号（如'A'->1, 'AB'->28），结果缓存在查找表中"""
+    idx = _COL_IDX.get(letters)
+    if idx is None:
+        idx = 0
+        for ch in letters:
+            idx = idx * 26 + _COL_IDX[ch]
+        _COL_IDX[letters] = idx
+    return idx
+
+
+# 算术求值允许的运算符白名单
+_ARITH_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_ARITH_UNARYOPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _eval_arithmetic(expr: str):
+    """求值只包含数字和四则运算的表达式
+
+    单元格引用和SUM在此之前已被替换成数字字面量，剩下的是纯算术。
+    用ast按白名单求值，替代eval，避免执行任意表达式。
+    """
+    def _eval_node(node):
+        if isinstance(node, ast.Expression):
+            return _eval_node(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITH_BINOPS:
+            return _ARITH_BINOPS[type(node.op)](
+                _eval_node(node.left), _eval_node(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _ARITH_UNARYOPS:
+            return _ARITH_UNARYOPS[type(node.op)](_eval_node(node.operand))
+        raise ValueError(f"不支持的表达式节点: {type(node).__name__}")
+
+    return _eval_node(ast.parse(expr, mode='eval'))
+
 
 def load_etf_data(file_path: str) -> pd.DataFrame:
     """
@@ -27,66 +96,170 @@ def load_etf_data(file_path: str) -> pd.DataFrame:
     logger = logging.getLogger(__name__)
     logger.info(f"开始加载Excel文件: {file_path}")
 
-    # 加载工作簿
-    # 使用data_only=False以便读取公式，然后手动评估
-    # 这样可以处理没有缓存值的公式单元格
-    wb = openpyxl.load_workbook(file_path, data_only=False)
-    ws = wb.active
+    # 优先使用calamine（Rust解析器，比纯Python的openpyxl快数倍），
+    # 公式单元格直接返回缓存的计算值
+    grid = _read_grid_calamine(file_path)
+    if grid is not None:
+        logger.info("使用calamine引擎读取工作表")
+        df, section_counts = _parse_grid(grid)
+        if len(df) > 0 and _section_counts_complete(section_counts):
+            return df
+        logger.warning("calamine读取的公式缓存值不完整，回退openpyxl手动求值")
+
+    # openpyxl回退路径：读取公式字符串并手动求值，
+    # 可以处理没有缓存值的公式单元格
+    grid = _read_grid_openpyxl(file_path)
+    df, _ = _parse_grid(grid)
+    return df
+
+
+def _section_counts_complete(section_counts: Dict[str, int]) -> bool:
+    """判断各section的数据量是否均衡
+
+    公式单元格没有缓存值时（文件从未被Excel重算保存过），
+    对应section解析出的数据会明显偏少甚至为空。
+    """
+    counts = list(section_counts.values())
+    if not counts:
+        return False
+    return min(counts) >= max(counts) * 0.5
+
+
+def _read_grid_calamine(file_path: str) -> Optional[List[List]]:
+    """使用calamine读取第一个工作表为二维数组
+
+    公式单元格返回文件中缓存的计算值（无需手动求值）。
+
+    Returns:
+        二维数组（行优先），calamine不可用或读取失败时返回None
+    """
+    if CalamineWorkbook is None:
+        return None
+
+    try:
+        wb = CalamineWorkbook.from_path(file_path)
+        rows = wb.get_sheet_by_index(0).to_python(skip_empty_area=False)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"calamine读取失败，回退openpyxl: {e}")
+        return None
+
+    # calamine用空字符串表示空单元格，统一成None以复用判空逻辑
+    return [[None if value == '' else value for value in row] for row in rows]
+
+
+def _read_grid_openpyxl(file_path: str) -> List[List]:
+    """使用openpyxl读取第一个工作表为二维数组
+
+    使用data_only=False以便读取公式字符串，然后由解析逻辑手动求值。
+    read_only=True以流式方式顺序读取，不构建完整的单元格对象图，
+    纯扫描场景下内存和耗时都明显更低。
+    """
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=False)
+    try:
+        ws = wb.active
+        return [list(row) for row in ws.iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def _grid_cell(grid: List[List], row: int, col: int):
+    """按openpyxl的1-based行列号读取二维数组中的单元格值"""
+    if row < 1 or row > len(grid):
+        return None
+    row_values = grid[row - 1]
+    if col < 1 or col > len(row_values):
+        return None
+    return row_values[col - 1]
+
+
+def _parse_grid(grid: List[List]) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """解析工作表二维数组并清洗为长格式DataFrame
+
+    Returns:
+        (清洗后的DataFrame, 各section的原始数据条数)
+    """
+    logger = logging.getLogger(__name__)
 
     # 检测所有sections
-    sections = _detect_sections(ws)
+    sections = _detect_sections(grid)
     logger.info(f"检测到 {len(sections)} 个sections")
 
-    # 解析所有sections
-    all_data = []
+    # 仅当网格含公式单元格时（openpyxl回退路径）才构建求值辅助结构，
+    # calamine路径全是缓存值，无需求值。公式memo跨section共享：
+    # 每个公式单元格在整次解析中只求值一次
+    has_formulas = _grid_has_formulas(grid)
+    sum_prefix = _numeric_prefix_sums(grid) if has_formulas else None
+    formula_memo = {} if has_formulas else None
+
+    # 解析所有sections；按列累积（SoA布局），DataFrame直接吃整列，
+    # 跳过逐行元组的类型推断
+    all_columns = {col: [] for col in
+                   ('code', 'name', 'date', 'metric_type', 'value', 'is_aggregate')}
+    section_counts = {}
     for section_name, section_info in sections.items():
         logger.info(f"解析section: {section_name}")
-        section_data = _parse_section(ws, section_name, section_info)
-        logger.info(f"  -> 该section加载了 {len(section_data)} 条原始数据")
-        all_data.extend(section_data)
+        section_columns = _parse_section(grid, section_name, section_info,
+                                         sum_prefix, formula_memo)
+        count = len(section_columns['code'])
+        logger.info(f"  -> 该section加载了 {count} 条原始数据")
+        section_counts[section_name] = count
+        for col, values in section_columns.items():
+            all_columns[col].extend(values)
 
     # 转换为DataFrame
-    df = pd.DataFrame(all_data, columns=['code', 'name', 'date', 'metric_type', 'value', 'is_aggregate'])
+    df = pd.DataFrame(all_columns)
 
     # 数据清洗
     logger.info(f"原始数据行数: {len(df)}")
 
-    # 显示每个metric_type的原始数据量
-    if len(df) > 0:
+    # 显示每个metric_type的原始数据量；value_counts一次哈希扫描完成，
+    # 避免逐指标做全表布尔过滤，且仅在INFO级别生效时才统计
+    if len(df) > 0 and logger.isEnabledFor(logging.INFO):
         logger.info("各指标原始数据量:")
-        for metric in df['metric_type'].unique():
-            count = len(df[df['metric_type'] == metric])
+        for metric, count in df['metric_type'].value_counts(sort=False).items():
             logger.info(f"  {metric}: {count} 行")
 
-    # 删除缺失值
-    df = df.dropna()
-    logger.info(f"删除缺失值后: {len(df)}")
-
-    # 转换日期为datetime
-    # 先检查日期格式
+    # 检查日期格式
     if len(df) > 0:
         sample_dates = df['date'].head(10).tolist()
         logger.debug(f"示例日期值: {sample_dates}")
 
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date'])
-    logger.info(f"转换日期后: {len(df)}")
+    # 转换日期为datetime
+    # 长表里每个日期重复出现上千次（每个ETF×每个指标一次），
+    # 只解析唯一值再map回整列，解析次数从O(行数)降到O(唯一日期数)
+    date_mapping = {raw: pd.to_datetime(raw, errors='coerce')
+                    for raw in df['date'].unique()}
+    # map产出object列，显式落回datetime64[ns]保持原有dtype
+    df['date'] = df['date'].map(date_mapping).astype('datetime64[ns]')
 
     # 转换值为数值类型
     df['value'] = pd.to_numeric(df['value'], errors='coerce')
-    df = df.dropna(subset=['value'])
-    logger.info(f"转换数值后: {len(df)}")
+
+    # 先转换后清洗：所有NA来源（缺码/缺名/坏日期/非数值）合成
+    # 一个布尔掩码一次过滤，替代三连dropna的三次整表复制
+    mask = (df['date'].notna() & df['value'].notna()
+            & df['code'].notna() & df['name'].notna())
+    df = df.loc[mask].reset_index(drop=True)
+    logger.info(f"清洗后数据行数: {len(df)}")
+
+    # 压缩dtype：重复度高的字符串列转category（布尔掩码/groupby变成
+    # 整数码比较），展示用数值降到float32，内存占用约减半
+    df['code'] = df['code'].astype('category')
+    df['name'] = df['name'].astype('category')
+    df['metric_type'] = df['metric_type'].astype('category')
+    df['value'] = df['value'].astype('float32')
+    df['is_aggregate'] = df['is_aggregate'].astype(bool)
 
     logger.info(f"最终数据行数: {len(df)}")
-    return df
+    return df, section_counts
 
 
-def _detect_sections(ws) -> Dict[str, Dict]:
+def _detect_sections(grid: List[List]) -> Dict[str, Dict]:
     """
-    检测Excel中的所有sections
+    检测工作表中的所有sections
 
     Args:
-        ws: openpyxl worksheet对象
+        grid: 工作表二维数组
 
     Returns:
         Dict[section_name, section_info]
@@ -94,22 +267,34 @@ def _detect_sections(ws) -> Dict[str, Dict]:
         注意：所有section共享全局的GLOBAL_DATE_ROW
     """
     sections = {}
-    keywords = ['市值', '份额', '变动', '申赎', '比例', '涨跌幅']
+    max_row = len(grid)
+
+    # 检测只看A/B两列，先各切出一份列视图，
+    # 后续所有边界扫描直接按列表索引，不再逐格调用_grid_cell
+    col_codes = [row[CODE_COL - 1] if len(row) >= CODE_COL else None for row in grid]
+    col_names = [row[NAME_COL - 1] if len(row) >= NAME_COL else None for row in grid]
+
+    # 单遍扫描找出所有header行（CODE_COL为空、NAME_COL含关键词），
+    # 各section的结束行直接由下一个header推导，
+    # 不再为每个header向后重扫一次（原来是O(section数×行数)）
+    header_rows = []
+    for row_idx in range(1, max_row + 1):
+        code_cell = col_codes[row_idx - 1]
+        name_cell = col_names[row_idx - 1]
+        if (code_cell is None and
+            name_cell and
+            isinstance(name_cell, str) and
+            _SECTION_KW_RE.search(name_cell)):
+            header_rows.append(row_idx)
 
     # 特殊处理：第一个section（总市值）没有header，直接从第3行开始
     # 检查第3行是否有ETF代码，如果有，说明存在这个特殊section
     first_data_row = 3
-    if ws.cell(first_data_row, CODE_COL).value:
-        # 找到第一个section的结束行（遇到空行或下一个section header）
-        data_end = ws.max_row
-        for row_idx in range(first_data_row, ws.max_row + 1):
-            code_cell = ws.cell(row_idx, CODE_COL).value
-            name_cell = ws.cell(row_idx, NAME_COL).value
-
-            # 遇到空行或section header，说明第一个section结束
-            if (code_cell is None and name_cell is None) or \
-               (code_cell is None and name_cell and isinstance(name_cell, str) and
-                any(kw in name_cell for kw in keywords)):
+    if max_row >= first_data_row and col_codes[first_data_row - 1]:
+        # 结束于首个header之前，中途遇到空行则提前结束
+        data_end = header_rows[0] - 1 if header_rows else max_row
+        for row_idx in range(first_data_row, data_end + 1):
+            if col_codes[row_idx - 1] is None and col_names[row_idx - 1] is None:
                 data_end = row_idx - 1
                 break
 
@@ -119,79 +304,127 @@ def _detect_sections(ws) -> Dict[str, Dict]:
             'data_end': data_end
         }
 
-    # 检测其他有header的sections
-    for row_idx in range(1, ws.max_row + 1):
-        code_cell = ws.cell(row_idx, CODE_COL).value
-        name_cell = ws.cell(row_idx, NAME_COL).value
-
-        # Section header特征：CODE_COL为空，NAME_COL包含关键词
-        if (code_cell is None and
-            name_cell and
-            isinstance(name_cell, str) and
-            any(kw in name_cell for kw in keywords)):
-
-            section_name = name_cell
-            header_row = row_idx
-            # 数据从header的下一行开始
-            data_start = row_idx + 1
-
-            # 找到数据结束行（下一个section开始或文件结束）
-            data_end = ws.max_row
-            for next_row in range(data_start, ws.max_row + 1):
-                next_code = ws.cell(next_row, CODE_COL).value
-                next_name = ws.cell(next_row, NAME_COL).value
-
-                # 检查是否是下一个section的header
-                if (next_code is None and
-                    next_name and
-                    isinstance(next_name, str) and
-                    any(kw in next_name for kw in keywords)):
-                    data_end = next_row - 1
-                    break
-
-            sections[section_name] = {
-                'header_row': header_row,
-                'data_start': data_start,
-                'data_end': data_end
-            }
+    # 其他有header的sections：数据区间为本header下一行到下个header前一行
+    for i, header_row in enumerate(header_rows):
+        next_header = header_rows[i + 1] if i + 1 < len(header_rows) else max_row + 1
+        sections[col_names[header_row - 1]] = {
+            'header_row': header_row,
+            'data_start': header_row + 1,
+            'data_end': next_header - 1
+        }
 
     return sections
 
 
-def _evaluate_simple_formula(ws, formula: str, row: int, col: int):
+def _grid_has_formulas(grid: List[List]) -> bool:
+    """判断网格中是否存在公式单元格（以'='开头的字符串）"""
+    return any(
+        isinstance(value, str) and value.startswith('=')
+        for row in grid for value in row
+    )
+
+
+def _numeric_prefix_sums(grid: List[List]) -> np.ndarray:
+    """构建网格数值单元格的二维前缀和（积分图）
+
+    多个SUM公式常引用大量重叠的区间（如SUM(C3:C15)、SUM(C3:C16)），
+    逐格累加会把同一单元格重复读O(N)次。先做一次前缀和，
+    之后任意矩形区间的求和都是O(1)。
+
+    Returns:
+        (行数+1) x (列数+1) 的float64数组，1-based索引与网格对齐，
+        cum[r][c]为左上角到(r, c)的数值单元格之和
+    """
+    rows = len(grid)
+    cols = max((len(row) for row in grid), default=0)
+    cum = np.zeros((rows + 1, cols + 1), dtype='float64')
+    for r, row_values in enumerate(grid, 1):
+        for c, value in enumerate(row_values, 1):
+            if value is not None and isinstance(value, (int, float)):
+                cum[r][c] = value
+    cum.cumsum(axis=0, out=cum)
+    cum.cumsum(axis=1, out=cum)
+    return cum
+
+
+# memo中的占位哨兵：标记正在求值的单元格，用于检测循环引用
+_EVALUATING = object()
+
+
+class _CircularRef(Exception):
+    """公式循环引用（携带成环单元格的(行, 列)，用于沿依赖链传播）"""
+
+    def __init__(self, key: Tuple[int, int]):
+        super().__init__(f"循环引用: {key}")
+        self.key = key
+
+
+def _evaluate_simple_formula(grid: List[List], formula: str, row: int, col: int,
+                             sum_prefix: Optional[np.ndarray] = None,
+                             memo: Optional[Dict[Tuple[int, int], object]] = None):
     """
     评估简单的Excel公式（主要是SUM公式和单元格引用）
 
     Args:
-        ws: worksheet对象
+        grid: 工作表二维数组
         formula: 公式字符串（如 "=SUM(C3:C15)*22000/16000" 或 "=D34-C34"）
         row: 当前单元格行号
         col: 当前单元格列号
+        sum_prefix: 可选的数值前缀和（见_numeric_prefix_sums），
+            提供时SUM区间求和为O(1)
+        memo: 可选的{(行, 列): 结果}缓存。被多个公式引用的单元格
+            只求值一次，深引用链从指数级重复求值降为每格一次
 
     Returns:
         计算结果，如果无法计算则返回None
     """
-    import re
+    key = (row, col)
+    if memo is not None:
+        if key in memo:
+            return memo[key]
+        # 先放哨兵占位：求值期间再被引用到即为循环引用，
+        # replace_cell_ref据此中止求值（结果为None）
+        memo[key] = _EVALUATING
+
+    try:
+        result = _evaluate_formula_uncached(grid, formula, row, col, sum_prefix, memo)
+    except _CircularRef as exc:
+        # 环上的每个单元格都判为无法求值；异常沿依赖链继续上抛，
+        # 直到发起成环引用的那个单元格为止
+        if memo is not None:
+            memo[key] = None
+        if exc.key != key:
+            raise
+        return None
+    if memo is not None:
+        memo[key] = result
+    return result
 
+
+def _evaluate_formula_uncached(grid: List[List], formula: str, row: int, col: int,
+                               sum_prefix: Optional[np.ndarray],
+                               memo: Optional[Dict[Tuple[int, int], object]]):
+    """_evaluate_simple_formula的实际求值逻辑（不经过memo）"""
     try:
         # 移除开头的等号
         formula = formula.lstrip('=')
 
         # 处理单元格引用: A1, B2, etc.
-        cell_pattern = r'([A-Z]+)(\d+)'
-
         def replace_cell_ref(match):
             col_letter = match.group(1)
             row_num = int(match.group(2))
 
             # 获取单元格值
-            col_idx = openpyxl.utils.column_index_from_string(col_letter)
-            cell = ws.cell(row_num, col_idx)
-            cell_value = cell.value
+            col_idx = _col_letter_to_index(col_letter)
+            cell_value = _grid_cell(grid, row_num, col_idx)
 
             # 如果单元格本身是公式，递归评估
-            if cell.data_type == 'f' and isinstance(cell_value, str):
-                cell_value = _evaluate_simple_formula(ws, cell_value, row_num, col_idx)
+            if isinstance(cell_value, str) and cell_value.startswith('='):
+                cell_value = _evaluate_simple_formula(
+                    grid, cell_value, row_num, col_idx, sum_prefix, memo)
+                if cell_value is _EVALUATING:
+                    # 引用到了正在求值的单元格：循环引用
+                    raise _CircularRef((row_num, col_idx))
 
             # 返回值
             if cell_value is None:
@@ -202,8 +435,6 @@ def _evaluate_simple_formula(ws, formula: str, row: int, col: int):
                 return '0'
 
         # 先处理SUM函数: SUM(C3:C15)
-        sum_pattern = r'SUM\(([A-Z]+)(\d+):([A-Z]+)(\d+)\)'
-
         def replace_sum(match):
             start_col = match.group(1)
             start_row = int(match.group(2))
@@ -211,67 +442,97 @@ def _evaluate_simple_formula(ws, formula: str, row: int, col: int):
             end_row = int(match.group(4))
 
             # 计算列号
-            start_col_idx = openpyxl.utils.column_index_from_string(start_col)
-            end_col_idx = openpyxl.utils.column_index_from_string(end_col)
-
-            # 求和
+            start_col_idx = _col_letter_to_index(start_col)
+            end_col_idx = _col_letter_to_index(end_col)
+
+            # 有前缀和时用积分图做O(1)区间求和
+            if sum_prefix is not None:
+                r2 = min(end_row, sum_prefix.shape[0] - 1)
+                c2 = min(end_col_idx, sum_prefix.shape[1] - 1)
+                r1, c1 = start_row, start_col_idx
+                if r1 > r2 or c1 > c2:
+                    return '0'
+                total = (sum_prefix[r2][c2] - sum_prefix[r1 - 1][c2]
+                         - sum_prefix[r2][c1 - 1] + sum_prefix[r1 - 1][c1 - 1])
+                return str(total)
+
+            # 无前缀和时逐格累加
             total = 0
             for r in range(start_row, end_row + 1):
                 for c in range(start_col_idx, end_col_idx + 1):
-                    cell_value = ws.cell(r, c).value
+                    cell_value = _grid_cell(grid, r, c)
                     if cell_value is not None and isinstance(cell_value, (int, float)):
                         total += cell_value
 
             return str(total)
 
         # 替换SUM函数
-        formula = re.sub(sum_pattern, replace_sum, formula, flags=re.IGNORECASE)
+        formula = _SUM_RE.sub(replace_sum, formula)
 
         # 替换单元格引用
-        formula = re.sub(cell_pattern, replace_cell_ref, formula)
+        formula = _CELL_REF_RE.sub(replace_cell_ref, formula)
 
         # 评估数学表达式
-        result = eval(formula)
-        return result
+        return _eval_arithmetic(formula)
 
+    except _CircularRef:
+        # 循环引用由_evaluate_simple_formula沿依赖链处理
+        raise
     except Exception:
         # 如果评估失败，返回None
         return None
 
 
-def _parse_section(ws, section_name: str, section_info: Dict) -> List[Tuple]:
+def _parse_section(grid: List[List], section_name: str, section_info: Dict,
+                   sum_prefix: Optional[np.ndarray] = None,
+                   memo: Optional[Dict[Tuple[int, int], object]] = None) -> Dict[str, List]:
     """
     解析单个section的数据
 
     Args:
-        ws: openpyxl worksheet对象
+        grid: 工作表二维数组
         section_name: section名称（作为metric_type）
         section_info: section信息（header_row, data_start, data_end）
+        sum_prefix: 可选的数值前缀和，传给公式求值加速SUM
+        memo: 可选的公式求值缓存，跨section共享
 
     Returns:
-        List of tuples: (code, name, date, metric_type, value, is_aggregate)
+        列式字典: {'code': [...], 'name': [...], 'date': [...],
+        'metric_type': [...], 'value': [...], 'is_aggregate': [...]}，
+        各列等长
     """
     logger = logging.getLogger(__name__)
-    data = []
+    # 按列累积（SoA），避免拼装逐行元组
+    codes: List = []
+    names: List = []
+    date_col: List = []
+    values: List = []
+    aggs: List = []
     data_start = section_info['data_start']
     data_end = section_info['data_end']
+    max_column = max((len(row) for row in grid), default=0)
 
     # 从全局日期行读取日期列表（从第3列开始）
     dates = []
     col_idx = DATA_START_COL
-    while col_idx <= ws.max_column:
-        date_val = ws.cell(GLOBAL_DATE_ROW, col_idx).value
+    while col_idx <= max_column:
+        date_val = _grid_cell(grid, GLOBAL_DATE_ROW, col_idx)
         if date_val is None:
             break
 
-        # 处理datetime对象
-        if isinstance(date_val, datetime):
-            dates.append(date_val.strftime("%Y-%m-%d"))
-        # 处理字符串
+        # 处理datetime/date对象（calamine返回date，openpyxl返回datetime）：
+        # 直接保留对象，省掉strftime再被下游重新解析的字符串往返
+        if isinstance(date_val, (datetime, date)):
+            dates.append(date_val)
+        # 处理字符串：标准化后就地解析一次（日期行只有几百个单元格）
         elif isinstance(date_val, str):
             # 标准化日期格式 (处理 2026/02/02 -> 2026-02-02)
             normalized = date_val.replace('/', '-')
-            dates.append(normalized)
+            try:
+                dates.append(datetime.strptime(normalized, '%Y-%m-%d'))
+            except ValueError:
+                # 非标准格式保留原串，交给下游的coerce处理
+                dates.append(normalized)
         else:
             # 其他类型尝试转换为字符串
             dates.append(str(date_val))
@@ -282,10 +543,12 @@ def _parse_section(ws, section_name: str, section_info: Dict) -> List[Tuple]:
     if len(dates) > 0:
         logger.debug(f"前5个日期: {dates[:5]}")
 
-    # 读取数据行
-    for row_idx in range(data_start, data_end + 1):
-        code = ws.cell(row_idx, CODE_COL).value
-        name = ws.cell(row_idx, NAME_COL).value
+    # 读取数据行；整行切片一次，避免对每个单元格调用_grid_cell
+    # 的函数与边界检查开销（内层循环是解析的热点）
+    for row_idx in range(data_start, min(data_end, len(grid)) + 1):
+        row_values = grid[row_idx - 1]
+        code = row_values[CODE_COL - 1] if len(row_values) >= CODE_COL else None
+        name = row_values[NAME_COL - 1] if len(row_values) >= NAME_COL else None
 
         # 跳过空行
         if code is None and name is None:
@@ -295,8 +558,7 @@ def _parse_section(ws, section_name: str, section_info: Dict) -> List[Tuple]:
         is_aggregate = False
         display_name = name
         if name and isinstance(name, str):
-            aggregate_keywords = ['总计', '合计', '总和']
-            if any(kw in name for kw in aggregate_keywords):
+            if _AGGREGATE_KW_RE.search(name):
                 is_aggregate = True
                 code = 'ALL'  # 汇总行使用特殊代码
             else:
@@ -304,28 +566,33 @@ def _parse_section(ws, section_name: str, section_info: Dict) -> List[Tuple]:
                 if code:
                     display_name = f"{code} - {name}"
 
-        # 读取该行的所有数据值
-        for col_offset, date_str in enumerate(dates):
+        # 读取该行的所有数据值；zip在较短一侧截断，
+        # 行比日期列短时缺失的尾部单元格等价于None被跳过
+        row_cells = row_values[DATA_START_COL - 1:DATA_START_COL - 1 + len(dates)]
+        for col_offset, (date_str, value) in enumerate(zip(dates, row_cells)):
             col_idx = DATA_START_COL + col_offset
-            cell = ws.cell(row_idx, col_idx)
-            value = cell.value
 
             # 如果是公式单元格，尝试评估公式
-            if cell.data_type == 'f' and value and isinstance(value, str):
-                value = _evaluate_simple_formula(ws, value, row_idx, col_idx)
+            if isinstance(value, str) and value.startswith('='):
+                value = _evaluate_simple_formula(
+                    grid, value, row_idx, col_idx, sum_prefix, memo)
 
             # 跳过空值
             if value is None:
                 continue
 
             # 添加数据记录
-            data.append((
-                code,
-                display_name,
-                date_str,
-                section_name,
-                value,
-                is_aggregate
-            ))
-
-    return data
+            codes.append(code)
+            names.append(display_name)
+            date_col.append(date_str)
+            values.append(value)
+            aggs.append(is_aggregate)
+
+    return {
+        'code': codes,
+        'name': names,
+        'date': date_col,
+        'metric_type': [section_name] * len(codes),
+        'value': values,
+        'is_aggregate': aggs,
+    }
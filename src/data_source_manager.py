@@ -1,7 +1,8 @@
 """数据源管理器 - 实现优先级fallback机制"""
 
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple
 from .data_sources.base import ETFDataSource
 from .exceptions import DataFetchError
 
@@ -12,6 +13,8 @@ class DataSourceManager:
     def __init__(self, sources: List[ETFDataSource]):
         self.sources = sources  # 按优先级排序
         self.logger = logging.getLogger(__name__)
+        # 交易日判断结果缓存：同一日期在一次会话内只询问数据源一次
+        self._trading_day_cache = {}
 
     def fetch_data(self, code: str, date: str) -> dict:
         """
@@ -37,13 +40,83 @@ class DataSourceManager:
 
         raise DataFetchError(f"所有数据源获取 {code} 数据失败")
 
+    def fetch_many(self, pairs: List[Tuple[str, str]], max_workers: int = 8) -> dict:
+        """并发获取一批(code, date)组合的数据
+
+        抓取是HTTP I/O密集型，线程在网络等待时释放GIL，适度并发即可
+        接近线性加速；worker数不宜过高，避免触发数据源限流。
+
+        Returns:
+            {(code, date): {'market_value': float, 'unit_price': float}}；
+            获取失败的组合不出现在结果中
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_data, code, date): (code, date)
+                for code, date in pairs
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except DataFetchError as e:
+                    self.logger.warning(f"✗ {key[0]} {key[1]} 获取失败: {e}")
+
+        return results
+
+    def fetch_bulk(self, codes: List[str], date: str) -> dict:
+        """批量获取多只ETF同一交易日的数据
+
+        支持批量接口的数据源（实现了fetch_bulk）一次RPC拿到多只结果，
+        未覆盖到的代码再走逐只的fetch_data优先级fallback。
+
+        Returns:
+            {code: {'market_value': float, 'unit_price': float}}；
+            所有数据源都失败的代码不出现在结果中
+        """
+        results = {}
+        remaining = list(codes)
+
+        for source in self.sources:
+            if not remaining:
+                break
+            bulk = getattr(source, 'fetch_bulk', None)
+            if bulk is None:
+                continue
+
+            try:
+                self.logger.info(
+                    f"尝试使用 {source.__class__.__name__} 批量获取 {len(remaining)} 只ETF")
+                results.update(bulk(remaining, date))
+                remaining = [code for code in remaining if code not in results]
+            except Exception as e:
+                self.logger.warning(
+                    f"✗ {source.__class__.__name__} 批量获取失败: {e}"
+                )
+
+        # 批量接口没覆盖到的代码逐只fallback
+        for code in remaining:
+            try:
+                results[code] = self.fetch_data(code, date)
+            except DataFetchError:
+                self.logger.warning(f"✗ {code} 所有数据源均失败")
+
+        return results
+
     def is_trading_day(self, date: str) -> bool:
-        """检查是否为交易日（使用第一个可用的数据源）"""
+        """检查是否为交易日（使用第一个可用的数据源，结果按日期缓存）"""
+        cached = self._trading_day_cache.get(date)
+        if cached is not None:
+            return cached
+
         for source in self.sources:
             try:
-                return source.is_trading_day(date)
+                result = source.is_trading_day(date)
+                self._trading_day_cache[date] = result
+                return result
             except Exception:
                 continue
-        # 如果所有数据源都失败，假设是交易日（保守策略）
+        # 如果所有数据源都失败，假设是交易日（保守策略，不缓存）
         self.logger.warning("无法确定交易日，假设为交易日")
         return True
@@ -3,6 +3,7 @@
 import akshare as ak
 import pandas as pd
 from datetime import datetime
+from typing import Optional
 from .base import ETFDataSource
 from ..exceptions import DataSourceError
 
@@ -10,6 +11,13 @@ from ..exceptions import DataSourceError
 class AkShareSource(ETFDataSource):
     """使用AkShare库获取ETF数据"""
 
+    def __init__(self):
+        # 交易日历缓存：整张日历只下载一次，后续判断走集合查找
+        self._trade_dates: Optional[frozenset] = None
+        # 按symbol缓存整段历史行情：fund_etf_hist_sina每次返回全量历史，
+        # 同一symbol查多个日期时只下载并规范化一次
+        self._hist_cache: dict = {}
+
     def get_etf_data(self, code: str, date: str) -> dict:
         """
         从AkShare获取ETF数据
@@ -25,11 +33,15 @@ class AkShareSource(ETFDataSource):
             # 移除代码前缀，AkShare使用纯数字代码
             symbol = code.replace('SH', '').replace('SZ', '')
 
-            # 获取ETF历史数据
-            df = ak.fund_etf_hist_sina(symbol=symbol)
+            # 获取ETF历史数据（接口总是返回全量历史，按symbol缓存，
+            # 日期规范化也只做一次）
+            df = self._hist_cache.get(symbol)
+            if df is None:
+                df = ak.fund_etf_hist_sina(symbol=symbol)
+                df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+                self._hist_cache[symbol] = df
 
             # 查找指定日期的数据
-            df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
             target_data = df[df['date'] == date]
 
             if target_data.empty:
@@ -62,11 +74,13 @@ class AkShareSource(ETFDataSource):
             bool: True表示是交易日
         """
         try:
-            # 获取交易日历
-            df = ak.tool_trade_date_hist_sina()
-            df['trade_date'] = pd.to_datetime(df['trade_date']).dt.strftime('%Y-%m-%d')
+            # 获取交易日历（仅首次下载，回补循环里每个日期都会调用）
+            if self._trade_dates is None:
+                df = ak.tool_trade_date_hist_sina()
+                self._trade_dates = frozenset(
+                    pd.to_datetime(df['trade_date']).dt.strftime('%Y-%m-%d'))
 
-            return date in df['trade_date'].values
+            return date in self._trade_dates
 
         except Exception as e:
             raise DataSourceError(f"AkShare检查交易日失败: {e}")
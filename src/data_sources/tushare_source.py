@@ -4,6 +4,7 @@ import tushare as ts
 import pandas as pd
 import logging
 from datetime import datetime
+from typing import Dict, List, Optional
 from .base import ETFDataSource
 from ..exceptions import DataSourceError
 
@@ -25,6 +26,8 @@ class TushareSource(ETFDataSource):
         self.token = token
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
+        # 交易日历缓存：一次拉取整段日历，后续判断走集合查找
+        self._trade_dates: Optional[frozenset] = None
 
         # 初始化Tushare API
         try:
@@ -34,6 +37,15 @@ class TushareSource(ETFDataSource):
         except Exception as e:
             raise DataSourceError(f"Tushare API初始化失败: {e}")
 
+    @staticmethod
+    def _to_ts_code(code: str) -> str:
+        """转换代码格式为Tushare格式（SH510300 -> 510300.SH, SZ159919 -> 159919.SZ）"""
+        if code.startswith('SH'):
+            return f"{code[2:]}.SH"
+        if code.startswith('SZ'):
+            return f"{code[2:]}.SZ"
+        return code
+
     def get_etf_data(self, code: str, date: str) -> dict:
         """
         从Tushare获取ETF数据
@@ -46,15 +58,7 @@ class TushareSource(ETFDataSource):
             {'market_value': float, 'unit_price': float}
         """
         try:
-            # 转换代码格式为Tushare格式
-            # SH510300 -> 510300.SH
-            # SZ159919 -> 159919.SZ
-            if code.startswith('SH'):
-                ts_code = f"{code[2:]}.SH"
-            elif code.startswith('SZ'):
-                ts_code = f"{code[2:]}.SZ"
-            else:
-                ts_code = code
+            ts_code = self._to_ts_code(code)
 
             # 转换日期格式 YYYY-MM-DD -> YYYYMMDD
             trade_date = pd.to_datetime(date).strftime('%Y%m%d')
@@ -85,37 +89,8 @@ class TushareSource(ETFDataSource):
             unit_price = float(row['close'])
 
             # 尝试获取总市值
-            market_value = None
-
-            # 方法1: 如果API返回了total_mv字段（总市值，单位：万元）
-            if 'total_mv' in row and pd.notna(row['total_mv']):
-                market_value = float(row['total_mv']) / 10000  # 转换为亿元
-                self.logger.info(f"{code} {date}: 从API获取总市值={market_value:.2f}亿元")
-            else:
-                # 方法2: 尝试通过份额数据计算
-                try:
-                    # 获取最近的份额数据（通常是季度数据）
-                    share_df = self.pro.fund_share(
-                        ts_code=ts_code,
-                        end_date=trade_date
-                    )
-
-                    if not share_df.empty:
-                        # 取最近的份额数据
-                        latest_share = share_df.iloc[0]
-                        # 基金份额（Tushare返回的是万份，需要转换为亿份）
-                        fd_share = float(latest_share['fd_share'])  # 单位：万份
-                        fund_share = fd_share / 10000  # 转换为亿份
-
-                        # 计算总市值（亿元）= 单位净值 × 基金份额
-                        market_value = unit_price * fund_share
-
-                        self.logger.info(
-                            f"{code} {date}: 单位净值={unit_price:.4f}, "
-                            f"份额={fund_share:.2f}亿份, 总市值={market_value:.2f}亿元"
-                        )
-                except Exception as e:
-                    self.logger.warning(f"获取 {code} 份额数据失败: {e}")
+            market_value = self._resolve_market_value(
+                row, ts_code, trade_date, code, date, unit_price)
 
             if market_value is None:
                 self.logger.warning(f"{code} 无法获取总市值数据")
@@ -130,32 +105,116 @@ class TushareSource(ETFDataSource):
         except Exception as e:
             raise DataSourceError(f"Tushare获取数据失败: {e}")
 
-    def is_trading_day(self, date: str) -> bool:
-        """
-        检查是否为交易日
+    def _resolve_market_value(self, row, ts_code: str, trade_date: str,
+                              code: str, date: str, unit_price: float) -> Optional[float]:
+        """从行情行解析总市值（亿元），无法解析时返回None"""
+        # 方法1: 如果API返回了total_mv字段（总市值，单位：万元）
+        if 'total_mv' in row and pd.notna(row['total_mv']):
+            market_value = float(row['total_mv']) / 10000  # 转换为亿元
+            self.logger.info(f"{code} {date}: 从API获取总市值={market_value:.2f}亿元")
+            return market_value
+
+        # 方法2: 尝试通过份额数据计算
+        try:
+            # 获取最近的份额数据（通常是季度数据）
+            share_df = self.pro.fund_share(
+                ts_code=ts_code,
+                end_date=trade_date
+            )
+
+            if not share_df.empty:
+                # 取最近的份额数据
+                latest_share = share_df.iloc[0]
+                # 基金份额（Tushare返回的是万份，需要转换为亿份）
+                fd_share = float(latest_share['fd_share'])  # 单位：万份
+                fund_share = fd_share / 10000  # 转换为亿份
+
+                # 计算总市值（亿元）= 单位净值 × 基金份额
+                market_value = unit_price * fund_share
+
+                self.logger.info(
+                    f"{code} {date}: 单位净值={unit_price:.4f}, "
+                    f"份额={fund_share:.2f}亿份, 总市值={market_value:.2f}亿元"
+                )
+                return market_value
+        except Exception as e:
+            self.logger.warning(f"获取 {code} 份额数据失败: {e}")
+
+        return None
+
+    def fetch_bulk(self, codes: List[str], date: str) -> Dict[str, dict]:
+        """一次RPC批量获取多只ETF在同一交易日的数据
+
+        fund_daily支持逗号拼接的ts_code，N只ETF的行情从N次请求合并为
+        1次；缺少total_mv的个券仍需逐只取份额数据补算总市值。
 
         Args:
+            codes: ETF代码列表（如 ['SH510300', 'SZ159919']）
             date: 日期（格式：YYYY-MM-DD）
 
         Returns:
-            bool: True表示是交易日
+            {code: {'market_value': float, 'unit_price': float}}，
+            当日无行情的代码不出现在结果中
         """
         try:
-            # 转换日期格式
             trade_date = pd.to_datetime(date).strftime('%Y%m%d')
+            ts_map = {self._to_ts_code(code): code for code in codes}
 
-            # 获取交易日历
-            df = self.pro.trade_cal(
-                exchange='SSE',
+            df = self.pro.fund_daily(
+                ts_code=','.join(ts_map),
                 start_date=trade_date,
                 end_date=trade_date
             )
+        except Exception as e:
+            raise DataSourceError(f"Tushare批量获取数据失败: {e}")
 
-            if df.empty:
-                return False
+        results: Dict[str, dict] = {}
+        if df is None or df.empty:
+            return results
 
-            # 检查is_open字段
-            return bool(df.iloc[0]['is_open'])
+        for _, row in df.iterrows():
+            code = ts_map.get(row['ts_code'])
+            if code is None:
+                continue
+
+            unit_price = float(row['close'])
+            market_value = self._resolve_market_value(
+                row, row['ts_code'], trade_date, code, date, unit_price)
+            if market_value is None:
+                self.logger.warning(f"{code} 无法获取总市值数据")
+
+            results[code] = {
+                'market_value': market_value,
+                'unit_price': unit_price
+            }
+
+        return results
+
+    def is_trading_day(self, date: str) -> bool:
+        """
+        检查是否为交易日
+
+        Args:
+            date: 日期（格式：YYYY-MM-DD）
+
+        Returns:
+            bool: True表示是交易日
+        """
+        try:
+            # 获取交易日历（仅首次拉取；覆盖到明年年底，
+            # 回补循环里每个日期的判断都变成集合查找）
+            if self._trade_dates is None:
+                df = self.pro.trade_cal(
+                    exchange='SSE',
+                    start_date='19900101',
+                    end_date=f"{datetime.now().year + 1}1231"
+                )
+
+                open_days = df[df['is_open'] == 1]['cal_date']
+                self._trade_dates = frozenset(
+                    pd.to_datetime(open_days).dt.strftime('%Y-%m-%d'))
+
+            return pd.to_datetime(date).strftime('%Y-%m-%d') in self._trade_dates
 
         except Exception as e:
             raise DataSourceError(f"Tushare检查交易日失败: {e}")
@@ -2,28 +2,61 @@
 
 import openpyxl
 import logging
+import numpy as np
+import re
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Dict, List, Optional
 
+from .utils import parse_ymd
 
-@dataclass
+# section识别关键词，模块级预编译成单次扫描的正则替代逐关键词substring查找
+_SECTION_KW_RE = re.compile('市值|份额|变动|申赎|比例|涨跌幅')
+_CALCULATED_KW_RE = re.compile('份额|变动|申赎|比例|涨跌幅')
+
+# 计算型section的整列公式，按Section.kind分发；prev为前一日整列值
+# （缺失→NaN），denom为prev去零后的分母（0→NaN）
+_KIND_FORMULAS = {
+    # 申赎净额与份额变动公式相同，共用share_delta
+    'share_delta': lambda share, mv, price, prev, denom: share - prev,
+    'share_pct': lambda share, mv, price, prev, denom: (share - prev) / denom * 100,
+    'mv_delta': lambda share, mv, price, prev, denom: mv - prev,
+    'price_pct': lambda share, mv, price, prev, denom: (price - prev) / denom * 100,
+}
+
+
+@dataclass(slots=True)
 class Section:
-    """Excel中的一个section"""
+    """Excel中的一个section
+
+    is_calculated/is_data_section在__post_init__里按名称分类一次存成
+    普通字段：update_data/recalculate_formulas在循环里反复读取，
+    property每次都要重跑关键词匹配；slots同时省掉每个实例的__dict__。
+    """
     name: str           # Section名称（如"总市值：亿元"）
     header_row: int     # 标题行号
     data_start: int     # 数据起始行号
     data_end: int       # 数据结束行号
-
-    @property
-    def is_calculated(self) -> bool:
-        """判断是否为计算型section"""
-        calculated_keywords = ['份额', '变动', '申赎', '比例', '涨跌幅']
-        return any(kw in self.name for kw in calculated_keywords)
-
-    @property
-    def is_data_section(self) -> bool:
-        """判断是否为需要更新的数据section"""
-        return '总市值' in self.name or '基金单位市值' in self.name
+    is_calculated: bool = False   # 是否为计算型section
+    is_data_section: bool = False  # 是否为需要更新的数据section
+    kind: Optional[str] = None    # 计算型section的公式类型（见_KIND_FORMULAS）
+
+    def __post_init__(self):
+        self.is_calculated = _CALCULATED_KW_RE.search(self.name) is not None
+        self.is_data_section = '总市值' in self.name or '基金单位市值' in self.name
+
+        # 公式类型只在这里判定一次，recalculate_formulas直接按kind分发
+        name = self.name
+        if '基金份额' in name and '变动' not in name:
+            self.kind = 'share'
+        elif ('基金份额变动' in name and '比例' not in name) or '申赎净额' in name:
+            self.kind = 'share_delta'
+        elif '份额变动比例' in name:
+            self.kind = 'share_pct'
+        elif '市值变动' in name:
+            self.kind = 'mv_delta'
+        elif '涨跌幅' in name:
+            self.kind = 'price_pct'
 
 
 class DynamicExcelManager:
@@ -39,10 +72,69 @@ class DynamicExcelManager:
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.logger = logging.getLogger(__name__)
-        # 使用 data_only=False 保留公式，keep_vba=True 保留宏
-        self.wb = openpyxl.load_workbook(file_path, keep_vba=True, data_only=False)
-        self.ws = self.wb.active
+        # 值快照：ws.cell()每次访问都要走坐标解析和维度检查，热路径里
+        # 逐格读取的开销远大于取值本身。这里一次性物化成二维列表，
+        # 之后所有读取走_v()；写入通过_set()同步回写快照，保证
+        # update_data之后recalculate_formulas读到的是新值
+        #
+        # 快照用read_only模式构建：流式解析、不为整张表构建Cell对象，
+        # 加载远快于完整模式。data_only保持False，公式单元格在快照里
+        # 仍是公式字符串，与写入工作簿看到的值一致
+        ro_wb = openpyxl.load_workbook(file_path, read_only=True, data_only=False)
+        try:
+            self._grid = [list(row) for row in ro_wb.active.iter_rows(values_only=True)]
+        finally:
+            ro_wb.close()
+        self._max_col = max((len(row) for row in self._grid), default=0)
+        # 完整的可写工作簿按需加载：纯查询用法（get_etf_codes、
+        # get_previous_day_data等）永远不用付完整加载的代价
+        self._wb = None
+        self._ws = None
         self.sections = self._detect_sections()
+        # 按角色预先分组：热路径里不再每次遍历全部section做过滤，
+        # 两个数据section也升级为直接属性引用
+        self.data_sections = [s for s in self.sections.values() if s.is_data_section]
+        self.calc_sections = [s for s in self.sections.values() if not s.is_data_section]
+        self.market_value_section = next(
+            (s for s in self.data_sections if '总市值' in s.name), None)
+        self.unit_price_section = next(
+            (s for s in self.data_sections if '基金单位市值' in s.name), None)
+        self._row_index = self._build_row_index()
+        # 日期→列号索引，首次用到时从日期行一次建立（见find_or_create_date_column）
+        self._date_to_col: Optional[Dict[str, int]] = None
+
+    @property
+    def wb(self):
+        """可写工作簿（首次访问时加载，data_only=False保留公式，keep_vba=True保留宏）"""
+        if self._wb is None:
+            self._wb = openpyxl.load_workbook(
+                self.file_path, keep_vba=True, data_only=False)
+            self._ws = self._wb.active
+        return self._wb
+
+    @property
+    def ws(self):
+        """可写工作表（首次访问时加载）"""
+        self.wb
+        return self._ws
+
+    def _v(self, row: int, col: int):
+        """从快照读取单元格值（1-based，越界返回None）"""
+        if 1 <= row <= len(self._grid) and 1 <= col <= len(self._grid[row - 1]):
+            return self._grid[row - 1][col - 1]
+        return None
+
+    def _set(self, row: int, col: int, value):
+        """写入单元格并同步快照（新日期列会超出快照宽度，按需扩展）"""
+        self.ws.cell(row, col, value)
+        while len(self._grid) < row:
+            self._grid.append([])
+        row_values = self._grid[row - 1]
+        if len(row_values) < col:
+            row_values.extend([None] * (col - len(row_values)))
+        row_values[col - 1] = value
+        if col > self._max_col:
+            self._max_col = col
 
     def _safe_float(self, value) -> Optional[float]:
         """安全地将单元格值转换为float，处理公式字符串的情况
@@ -70,7 +162,7 @@ class DynamicExcelManager:
 
         # 特殊处理第一个section（总市值）
         # 第一行是标题行，第二行是日期行，第三行开始是数据
-        first_section_name = self.ws.cell(self.HEADER_ROW, self.DATA_START_COL).value
+        first_section_name = self._v(self.HEADER_ROW, self.DATA_START_COL)
         if first_section_name and isinstance(first_section_name, str):
             current_section = Section(
                 name=first_section_name,
@@ -79,7 +171,7 @@ class DynamicExcelManager:
                 data_end=None
             )
 
-        for row_idx in range(1, self.ws.max_row + 1):
+        for row_idx in range(1, len(self._grid) + 1):
             if self._is_section_header(row_idx):
                 # 结束上一个section
                 if current_section:
@@ -87,7 +179,7 @@ class DynamicExcelManager:
                     sections[current_section.name] = current_section
 
                 # 开始新section
-                section_name = self.ws.cell(row_idx, self.NAME_COL).value
+                section_name = self._v(row_idx, self.NAME_COL)
                 current_section = Section(
                     name=section_name,
                     header_row=row_idx,
@@ -97,7 +189,7 @@ class DynamicExcelManager:
 
         # 处理最后一个section
         if current_section:
-            current_section.data_end = self.ws.max_row
+            current_section.data_end = len(self._grid)
             sections[current_section.name] = current_section
 
         self.logger.info(f"检测到 {len(sections)} 个section")
@@ -105,30 +197,26 @@ class DynamicExcelManager:
 
     def _is_section_header(self, row: int) -> bool:
         """判断是否为section标题行"""
-        code_cell = self.ws.cell(row, self.CODE_COL).value
-        name_cell = self.ws.cell(row, self.NAME_COL).value
+        code_cell = self._v(row, self.CODE_COL)
+        name_cell = self._v(row, self.NAME_COL)
 
         # Section header特征：第0列为空，第1列包含关键词
-        keywords = ['市值', '份额', '变动', '申赎', '比例', '涨跌幅']
         return (code_cell is None and
-                name_cell and
+                name_cell is not None and
                 isinstance(name_cell, str) and
-                any(kw in name_cell for kw in keywords))
+                _SECTION_KW_RE.search(name_cell) is not None)
 
     def get_etf_codes(self) -> List[str]:
         """从第一个数据section获取所有ETF代码"""
-        # 找到第一个数据section
-        data_section = next(
-            (s for s in self.sections.values() if s.is_data_section),
-            None
-        )
+        # 第一个数据section
+        data_section = self.data_sections[0] if self.data_sections else None
 
         if not data_section:
             raise ValueError("未找到数据section")
 
         codes = []
         for row in range(data_section.data_start, data_section.data_end + 1):
-            code = self.ws.cell(row, self.CODE_COL).value
+            code = self._v(row, self.CODE_COL)
             if code and isinstance(code, str):
                 codes.append(code)
 
@@ -136,29 +224,25 @@ class DynamicExcelManager:
 
     def get_etf_name(self, code: str) -> Optional[str]:
         """获取ETF名称"""
-        # 找到第一个数据section
-        data_section = next(
-            (s for s in self.sections.values() if s.is_data_section),
-            None
-        )
+        # 第一个数据section
+        data_section = self.data_sections[0] if self.data_sections else None
 
         if not data_section:
             return None
 
         for row in range(data_section.data_start, data_section.data_end + 1):
-            if self.ws.cell(row, self.CODE_COL).value == code:
-                return self.ws.cell(row, self.NAME_COL).value
+            if self._v(row, self.CODE_COL) == code:
+                return self._v(row, self.NAME_COL)
 
         return None
 
     def get_previous_day_data(self, code: str, date: str) -> Optional[Dict[str, float]]:
         """获取前一天的数据"""
-        from datetime import datetime
-
         col_idx = None
         # 查找当前日期列
-        for col in range(self.DATA_START_COL, self.ws.max_column + 1):
-            date_val = self.ws.cell(self.DATE_ROW, col).value
+        date_row = self._grid[self.DATE_ROW - 1]
+        for col in range(self.DATA_START_COL, len(date_row) + 1):
+            date_val = date_row[col - 1]
 
             # 处理datetime对象
             if isinstance(date_val, datetime):
@@ -182,15 +266,12 @@ class DynamicExcelManager:
         market_value = None
         unit_price = None
 
-        for section in self.sections.values():
-            if not section.is_data_section:
-                continue
-
+        for section in self.data_sections:
             row_idx = self._find_etf_row(code, section)
             if row_idx is None:
                 continue
 
-            value = self._safe_float(self.ws.cell(row_idx, prev_col).value)
+            value = self._safe_float(self._v(row_idx, prev_col))
             if value is not None:
                 if '总市值' in section.name:
                     market_value = value
@@ -205,29 +286,41 @@ class DynamicExcelManager:
 
         return None
 
-    def find_or_create_date_column(self, target_date: str) -> int:
-        """查找或创建日期列"""
-        from datetime import datetime
-
-        # 在DATE_ROW查找日期
-        for col in range(self.DATA_START_COL, self.ws.max_column + 1):
-            date_val = self.ws.cell(self.DATE_ROW, col).value
+    def _build_date_index(self) -> Dict[str, int]:
+        """扫描日期行一次，建立 YYYY-MM-DD→列号 索引"""
+        index = {}
+        date_row = self._grid[self.DATE_ROW - 1]
+        for col in range(self.DATA_START_COL, len(date_row) + 1):
+            date_val = date_row[col - 1]
 
             # 处理datetime对象
             if isinstance(date_val, datetime):
-                date_str = date_val.strftime('%Y-%m-%d')
-                if date_str == target_date:
-                    return col
+                index[date_val.strftime('%Y-%m-%d')] = col
             # 处理字符串
             elif isinstance(date_val, str):
-                if date_val == target_date:
-                    return col
+                index[date_val] = col
+
+        return index
+
+    def find_or_create_date_column(self, target_date: str) -> int:
+        """查找或创建日期列
+
+        update_data对每个ETF都会调用一次；日期行只在首次扫描一遍，
+        之后同一日期的查找都是O(1)，新建的列同步写进索引。
+        """
+        if self._date_to_col is None:
+            self._date_to_col = self._build_date_index()
+
+        col = self._date_to_col.get(target_date)
+        if col is not None:
+            return col
 
         # 未找到，在最后添加新列
-        new_col = self.ws.max_column + 1
+        new_col = self._max_col + 1
         # 将日期作为datetime对象存储，保持与现有格式一致
-        date_obj = datetime.strptime(target_date, '%Y-%m-%d')
-        self.ws.cell(self.DATE_ROW, new_col, date_obj)
+        date_obj = parse_ymd(target_date)
+        self._set(self.DATE_ROW, new_col, date_obj)
+        self._date_to_col[target_date] = new_col
         self.logger.info(f"创建新日期列: {target_date} (列{new_col})")
         return new_col
 
@@ -237,10 +330,7 @@ class DynamicExcelManager:
         col_idx = self.find_or_create_date_column(date)
 
         # 只更新数据section
-        for section in self.sections.values():
-            if not section.is_data_section:
-                continue
-
+        for section in self.data_sections:
             row_idx = self._find_etf_row(code, section)
             if row_idx is None:
                 self.logger.warning(
@@ -250,7 +340,7 @@ class DynamicExcelManager:
 
             # 根据section类型更新对应的值
             value = market_value if '总市值' in section.name else unit_price
-            self.ws.cell(row_idx, col_idx, value)
+            self._set(row_idx, col_idx, value)
             self.logger.debug(
                 f"更新 {code} {section.name}: {value}"
             )
@@ -264,143 +354,105 @@ class DynamicExcelManager:
         """
         col_idx = self.find_or_create_date_column(date)
 
-        # 获取所有ETF的总市值和单位市值数据
-        etf_data = {}  # {code: {'market_value': float, 'unit_price': float, 'name': str}}
+        # 单趟收集：沿"总市值"section走一遍，单位净值行经行索引直接
+        # 定位，总市值和单位净值同时取出，不再先建dict再二次过滤
+        codes: List[str] = []
+        mv_list: List[float] = []
+        price_list: List[float] = []
+
+        if self.market_value_section and self.unit_price_section:
+            unit_index = self._row_index.get(self.unit_price_section.name, {})
+            section = self.market_value_section
+            for row in range(section.data_start, section.data_end + 1):
+                code = self._v(row, self.CODE_COL)
+                if not code:
+                    continue
+                market_value = self._v(row, col_idx)
+                if market_value is None:
+                    continue
+                unit_row = unit_index.get(code)
+                if unit_row is None:
+                    continue
+                unit_price = self._v(unit_row, col_idx)
+                if unit_price is None:
+                    continue
 
-        # 从"总市值" section读取数据
-        market_value_section = None
-        for section in self.sections.values():
-            if '总市值' in section.name:
-                market_value_section = section
-                break
-
-        if market_value_section:
-            for row in range(market_value_section.data_start, market_value_section.data_end + 1):
-                code = self.ws.cell(row, self.CODE_COL).value
-                name = self.ws.cell(row, self.NAME_COL).value
-                market_value = self.ws.cell(row, col_idx).value
-
-                if code and market_value is not None:
-                    etf_data[code] = {
-                        'market_value': float(market_value),
-                        'name': name
-                    }
-
-        # 从"基金单位市值" section读取单位净值
-        for section in self.sections.values():
-            if '基金单位市值' in section.name:
-                for row in range(section.data_start, section.data_end + 1):
-                    code = self.ws.cell(row, self.CODE_COL).value
-                    unit_price = self.ws.cell(row, col_idx).value
-
-                    if code and code in etf_data and unit_price is not None:
-                        etf_data[code]['unit_price'] = float(unit_price)
-                break
-
-        # 计算并更新其他sections
-        for code, data in etf_data.items():
-            if 'unit_price' not in data:
-                continue
+                codes.append(code)
+                mv_list.append(float(market_value))
+                price_list.append(float(unit_price))
 
-            market_value = data['market_value']
-            unit_price = data['unit_price']
+        # 向量化计算：section类型判断每个section只做一次（而不是每个
+        # (ETF, section)组合一次），单个section的整列派生值用NumPy
+        # 数组运算一次算完，再按行写回
+        if not codes:
+            self.logger.info(f"已重新计算日期 {date} 的所有公式值")
+            return
 
-            # 计算基金份额（亿份）= 总市值（亿元）/ 单位净值（元）
-            fund_share = market_value / unit_price if unit_price != 0 else 0
+        mv_curr = np.array(mv_list)
+        price_curr = np.array(price_list)
 
-            # 更新各个计算型section
-            for section in self.sections.values():
-                if section.is_data_section:
-                    continue  # 跳过原始数据section
+        # 计算基金份额（亿份）= 总市值（亿元）/ 单位净值（元）
+        fund_share = np.where(price_curr != 0,
+                              mv_curr / np.where(price_curr != 0, price_curr, 1.0),
+                              0.0)
 
-                row_idx = self._find_etf_row(code, section)
-                if row_idx is None:
-                    continue
+        prev_col = col_idx - 1
+        has_prev = prev_col >= self.DATA_START_COL
+
+        # 更新各个计算型section（公式类型已在Section判定，按kind分发）
+        for section in self.calc_sections:
+            kind = section.kind
+            if kind is None:
+                continue
+
+            # 对齐到该section实际存在的行
+            section_index = self._row_index.get(section.name, {})
+            pairs = [(i, section_index[c]) for i, c in enumerate(codes)
+                     if c in section_index]
+            if not pairs:
+                continue
+            idx = np.array([i for i, _ in pairs])
+            rows = [r for _, r in pairs]
 
-                # 根据section类型计算值
-                if '基金份额' in section.name and '变动' not in section.name:
-                    # 基金份额
-                    value = fund_share
-                elif '基金份额变动' in section.name and '比例' not in section.name:
-                    # 基金份额变动：需要前一天的数据
-                    prev_col = col_idx - 1
-                    if prev_col >= self.DATA_START_COL:
-                        prev_share_cell = self.ws.cell(row_idx, prev_col).value
-                        prev_share = self._safe_float(prev_share_cell)
-                        if prev_share is not None:
-                            value = fund_share - prev_share
-                        else:
-                            value = None
-                    else:
-                        value = None
-                elif '申赎净额' in section.name:
-                    # 申赎净额：与份额变动相同
-                    prev_col = col_idx - 1
-                    if prev_col >= self.DATA_START_COL:
-                        prev_share_cell = self.ws.cell(row_idx, prev_col).value
-                        prev_share = self._safe_float(prev_share_cell)
-                        if prev_share is not None:
-                            value = fund_share - prev_share
-                        else:
-                            value = None
-                    else:
-                        value = None
-                elif '份额变动比例' in section.name:
-                    # 份额变动比例
-                    prev_col = col_idx - 1
-                    if prev_col >= self.DATA_START_COL:
-                        prev_share_cell = self.ws.cell(row_idx, prev_col).value
-                        prev_share = self._safe_float(prev_share_cell)
-                        if prev_share is not None and prev_share != 0:
-                            share_change = fund_share - prev_share
-                            value = (share_change / prev_share) * 100
-                        else:
-                            value = None
-                    else:
-                        value = None
-                elif '市值变动' in section.name:
-                    # 市值变动
-                    prev_col = col_idx - 1
-                    if prev_col >= self.DATA_START_COL:
-                        prev_mv_cell = self.ws.cell(row_idx, prev_col).value
-                        prev_mv = self._safe_float(prev_mv_cell)
-                        if prev_mv is not None:
-                            value = market_value - prev_mv
-                        else:
-                            value = None
-                    else:
-                        value = None
-                elif '涨跌幅' in section.name:
-                    # 涨跌幅
-                    prev_col = col_idx - 1
-                    if prev_col >= self.DATA_START_COL:
-                        prev_price_cell = self.ws.cell(row_idx, prev_col).value
-                        prev_price = self._safe_float(prev_price_cell)
-                        if prev_price is not None and prev_price != 0:
-                            price_change = unit_price - prev_price
-                            value = (price_change / prev_price) * 100
-                        else:
-                            value = None
-                    else:
-                        value = None
-                else:
+            if kind == 'share':
+                values = fund_share[idx]
+            else:
+                if not has_prev:
                     continue
+                prev = np.array([self._safe_float(self._v(r, prev_col))
+                                 for r in rows], dtype=float)
+                # 缺失/公式单元格→NaN，除零也落到NaN，写回时统一跳过
+                denom = np.where(prev != 0, prev, np.nan)
+                values = _KIND_FORMULAS[kind](
+                    fund_share[idx], mv_curr[idx], price_curr[idx], prev, denom)
 
-                # 更新单元格值
-                if value is not None:
-                    self.ws.cell(row_idx, col_idx, value)
-                    self.logger.debug(
-                        f"计算 {code} {section.name}: {value}"
-                    )
+            for row_idx, value in zip(rows, values):
+                if not np.isnan(value):
+                    self._set(row_idx, col_idx, float(value))
 
         self.logger.info(f"已重新计算日期 {date} 的所有公式值")
 
+    def _build_row_index(self) -> Dict[str, Dict[str, int]]:
+        """为每个section建立 代码→行号 索引
+
+        update_data/recalculate_formulas对每个(代码, section)组合都要
+        定位行，逐行线性扫描是O(ETF数×section数×行数)的cell访问；
+        每个section只扫一遍建成dict后，查找降为O(1)。
+        行在整个生命周期内不会增删，索引无需失效。
+        """
+        index = {}
+        for section in self.sections.values():
+            section_index = {}
+            for row in range(section.data_start, section.data_end + 1):
+                code = self._v(row, self.CODE_COL)
+                if code is not None:
+                    section_index[code] = row
+            index[section.name] = section_index
+        return index
+
     def _find_etf_row(self, code: str, section: Section) -> Optional[int]:
-        """在指定section中查找ETF行"""
-        for row in range(section.data_start, section.data_end + 1):
-            if self.ws.cell(row, self.CODE_COL).value == code:
-                return row
-        return None
+        """在指定section中查找ETF行（索引O(1)查找）"""
+        return self._row_index.get(section.name, {}).get(code)
 
     def save(self):
         """保存Excel文件"""
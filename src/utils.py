@@ -4,9 +4,19 @@ import logging
 from logging.handlers import RotatingFileHandler
 import os
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import List, Dict
 
 
+def parse_ymd(date_str: str) -> datetime:
+    """解析YYYY-MM-DD格式的日期字符串
+
+    strptime每次调用都要解释格式串，固定格式下直接切片取整数
+    快一个数量级；Excel管理器对每个ETF更新都要解析一次日期。
+    """
+    return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+
 def setup_logging(log_level: str = 'INFO') -> logging.Logger:
     """配置日志系统"""
     logger = logging.getLogger('etf_updater')
@@ -5,6 +5,8 @@ import logging
 from datetime import datetime
 from typing import List, Optional, Dict
 
+from .utils import parse_ymd
+
 
 class XlwingsExcelManager:
     """使用xlwings的Excel管理器，完美保留Excel格式和数据"""
@@ -29,6 +31,16 @@ class XlwingsExcelManager:
         self.wb = self.app.books.open(file_path)
         self.ws = self.wb.sheets[0]
 
+        # 代码列/名称列快照：每次range访问都是一次跨进程COM调用，
+        # 逐格扫描定位ETF行的成本是毫秒级×行数。两列在一次运行中
+        # 不会变化，首次用到时各用一次COM调用整列读出（见_load_columns）
+        self._max_row: Optional[int] = None
+        self._col_a: Optional[List] = None
+        self._col_b: Optional[List] = None
+        # 日期→列号缓存：update_data对每个ETF都要定位日期列，
+        # 同一日期只扫描日期行一次，新建的列同步写进缓存
+        self._date_col_cache: Dict[str, int] = {}
+
         self.logger.info(f"已使用xlwings打开文件: {file_path}")
 
     def __del__(self):
@@ -41,14 +53,30 @@ class XlwingsExcelManager:
         except:
             pass
 
+    def _load_columns(self):
+        """首次调用时把代码列和名称列整列读进内存（各一次COM调用）"""
+        if self._col_a is None:
+            self._max_row = self.ws.used_range.last_cell.row
+            self._col_a = self._column_values(self.CODE_COL, self._max_row)
+            self._col_b = self._column_values(self.NAME_COL, self._max_row)
+
+    def _cell_a(self, row: int):
+        """从快照读代码列（1-based，越界返回None）"""
+        return self._col_a[row - 1] if row <= self._max_row else None
+
+    def _cell_b(self, row: int):
+        """从快照读名称列（1-based，越界返回None）"""
+        return self._col_b[row - 1] if row <= self._max_row else None
+
     def get_etf_codes(self) -> List[str]:
         """从第一个数据section获取所有ETF代码"""
+        self._load_columns()
         codes = []
 
         # 从第3行开始读取代码（跳过标题行和日期行）
         row = 3
         while True:
-            code = self.ws.range(f'A{row}').value
+            code = self._cell_a(row)
             if code is None:
                 break
             if isinstance(code, str) and code.strip():
@@ -56,7 +84,7 @@ class XlwingsExcelManager:
             row += 1
 
             # 检查是否到达section分隔符
-            name_cell = self.ws.range(f'B{row}').value
+            name_cell = self._cell_b(row)
             if name_cell and '市值' in str(name_cell):
                 break
 
@@ -65,34 +93,41 @@ class XlwingsExcelManager:
 
     def get_etf_name(self, code: str) -> Optional[str]:
         """获取ETF名称"""
+        self._load_columns()
         row = 3
         while True:
-            cell_code = self.ws.range(f'A{row}').value
+            cell_code = self._cell_a(row)
             if cell_code is None:
                 break
 
             if str(cell_code).strip() == code:
-                name = self.ws.range(f'B{row}').value
-                return name
+                return self._cell_b(row)
 
             row += 1
 
             # 检查是否到达section分隔符
-            name_cell = self.ws.range(f'B{row}').value
+            name_cell = self._cell_b(row)
             if name_cell and '市值' in str(name_cell):
                 break
 
         return None
 
+    def _scan_date_row(self):
+        """一次COM调用读出日期行（DATA_START_COL到used range右边界）"""
+        max_col = self.ws.used_range.last_cell.column
+        values = self.ws.range(
+            (self.DATE_ROW, self.DATA_START_COL), (self.DATE_ROW, max_col)).value
+        if not isinstance(values, list):
+            values = [values]
+        return values, max_col
+
     def get_previous_day_data(self, code: str, date: str) -> Optional[Dict[str, float]]:
         """获取前一天的数据"""
         col_idx = None
-        # 查找当前日期列
-        col = self.DATA_START_COL
-        max_col = self.ws.used_range.last_cell.column
-
-        while col <= max_col:
-            date_val = self.ws.range((self.DATE_ROW, col)).value
+        # 查找当前日期列（日期行整段一次读出，匹配在Python侧完成）
+        date_row, _ = self._scan_date_row()
+        for offset, date_val in enumerate(date_row):
+            col = self.DATA_START_COL + offset
 
             # 处理datetime对象
             if isinstance(date_val, datetime):
@@ -106,19 +141,18 @@ class XlwingsExcelManager:
                     col_idx = col
                     break
 
-            col += 1
-
         if col_idx is None or col_idx <= self.DATA_START_COL:
             return None
 
         # 前一列就是前一天
         prev_col = col_idx - 1
 
-        # 获取总市值
+        # 获取总市值（行定位走列快照，只有取值是COM调用）
+        self._load_columns()
         market_value = None
         row = 3
         while True:
-            cell_code = self.ws.range(f'A{row}').value
+            cell_code = self._cell_a(row)
             if cell_code is None:
                 break
 
@@ -129,7 +163,7 @@ class XlwingsExcelManager:
             row += 1
 
             # 检查是否到达section分隔符
-            name_cell = self.ws.range(f'B{row}').value
+            name_cell = self._cell_b(row)
             if name_cell and '市值' in str(name_cell):
                 break
 
@@ -139,14 +173,14 @@ class XlwingsExcelManager:
         in_unit_section = False
 
         while row < 1000:
-            name_cell = self.ws.range(f'B{row}').value
+            name_cell = self._cell_b(row)
             if name_cell and '基金单位市值' in str(name_cell):
                 in_unit_section = True
                 row += 1
                 continue
 
             if in_unit_section:
-                cell_code = self.ws.range(f'A{row}').value
+                cell_code = self._cell_a(row)
                 if cell_code is None or (isinstance(cell_code, str) and '市值' in cell_code):
                     break
 
@@ -165,24 +199,27 @@ class XlwingsExcelManager:
         return None
 
     def find_or_create_date_column(self, target_date: str) -> int:
-        """查找或创建日期列"""
-        # 在DATE_ROW查找日期
-        col = self.DATA_START_COL
-        max_col = self.ws.used_range.last_cell.column
-
-        while col <= max_col + 1:
-            date_val = self.ws.range((self.DATE_ROW, col)).value
+        """查找或创建日期列（结果按日期缓存，重复调用不再扫描日期行）"""
+        cached = self._date_col_cache.get(target_date)
+        if cached is not None:
+            return cached
 
+        # 在DATE_ROW查找日期（整段一次读出，匹配在Python侧完成）
+        date_row, max_col = self._scan_date_row()
+        col = self.DATA_START_COL
+        for date_val in date_row:
             # 处理datetime对象
             if isinstance(date_val, datetime):
                 date_str = date_val.strftime('%Y-%m-%d')
                 if date_str == target_date:
                     self.logger.info(f"找到日期列: {target_date} (列{col})")
+                    self._date_col_cache[target_date] = col
                     return col
             # 处理字符串
             elif isinstance(date_val, str):
                 if date_val == target_date:
                     self.logger.info(f"找到日期列: {target_date} (列{col})")
+                    self._date_col_cache[target_date] = col
                     return col
             # 如果是空列，说明到达末尾
             elif date_val is None and col > self.DATA_START_COL:
@@ -190,10 +227,11 @@ class XlwingsExcelManager:
 
             col += 1
 
-        # 未找到，在最后添加新列
+        # 未找到，在最后添加新列（col停在首个空列或日期行末尾之后）
         new_col = col
-        date_obj = datetime.strptime(target_date, '%Y-%m-%d')
+        date_obj = parse_ymd(target_date)
         self.ws.range((self.DATE_ROW, new_col)).value = date_obj
+        self._date_col_cache[target_date] = new_col
         self.logger.info(f"创建新日期列: {target_date} (列{new_col})")
         return new_col
 
@@ -201,12 +239,13 @@ class XlwingsExcelManager:
         """更新指定ETF的数据"""
         col_idx = self.find_or_create_date_column(date)
 
-        # 找到ETF所在的行
+        # 行定位全部走列快照，每个ETF只剩两次写入的COM调用
+        self._load_columns()
         row = 3
         found = False
 
         while True:
-            cell_code = self.ws.range(f'A{row}').value
+            cell_code = self._cell_a(row)
             if cell_code is None:
                 break
 
@@ -233,14 +272,14 @@ class XlwingsExcelManager:
         in_unit_section = False
 
         while row < 1000:
-            name_cell = self.ws.range(f'B{row}').value
+            name_cell = self._cell_b(row)
             if name_cell and '基金单位市值' in str(name_cell):
                 in_unit_section = True
                 row += 1
                 continue
 
             if in_unit_section:
-                cell_code = self.ws.range(f'A{row}').value
+                cell_code = self._cell_a(row)
                 if cell_code is None or (isinstance(cell_code, str) and '市值' in cell_code):
                     break
 
@@ -251,6 +290,95 @@ class XlwingsExcelManager:
 
             row += 1
 
+    def batch_update(self, date: str, records: List[tuple]):
+        """批量更新一批ETF的数据，按日期列整块写入
+
+        xlwings的每次range访问都是一次跨进程COM调用，逐格写N个ETF
+        需要O(N)次往返。这里先整列读出代码/名称定位section边界，
+        再把目标日期列按section合并成二维列表一次性写回，
+        COM往返次数与ETF数量无关。
+
+        Args:
+            date: 目标日期（YYYY-MM-DD）
+            records: [(code, market_value, unit_price), ...]
+        """
+        if not records:
+            return
+
+        col_idx = self.find_or_create_date_column(date)
+        updates = {str(code).strip(): (mv, up) for code, mv, up in records}
+
+        # 代码与名称走列快照，边界判断全部在Python侧完成
+        self._load_columns()
+        max_row = self._max_row
+        col_a = self._col_a
+        col_b = self._col_b
+
+        # 暂停自动重算，避免每次写入都触发全表计算
+        prev_calculation = self.app.calculation
+        self.app.calculation = 'manual'
+        try:
+            # 第一个section（总市值）：第3行起到A列首个空单元格
+            start = 3
+            end = start
+            while end <= max_row and col_a[end - 1] is not None:
+                end += 1
+            end -= 1
+            if end >= start:
+                self._write_column_block(start, end, col_idx, col_a, updates, 0)
+
+            # 基金单位市值section
+            unit_start = None
+            for row in range(3, max_row + 1):
+                name_cell = col_b[row - 1]
+                if name_cell and '基金单位市值' in str(name_cell):
+                    unit_start = row + 1
+                    break
+
+            if unit_start is not None:
+                end = unit_start
+                while end <= max_row:
+                    cell_code = col_a[end - 1]
+                    if cell_code is None or (isinstance(cell_code, str) and '市值' in cell_code):
+                        break
+                    end += 1
+                end -= 1
+                if end >= unit_start:
+                    self._write_column_block(unit_start, end, col_idx, col_a, updates, 1)
+        finally:
+            self.app.calculation = prev_calculation
+
+        self.logger.info(f"批量更新完成: {len(records)} 个ETF (列{col_idx})")
+
+    def _column_values(self, col: int, max_row: int) -> List:
+        """一次COM调用读出一整列（第1行到max_row）"""
+        values = self.ws.range((1, col), (max_row, col)).value
+        # 单行range返回标量而非列表
+        if not isinstance(values, list):
+            values = [values]
+        return values
+
+    def _write_column_block(self, start: int, end: int, col_idx: int,
+                            col_a: List, updates: Dict, value_index: int):
+        """把一个section在目标日期列上的值整块写回
+
+        本次未更新的ETF保留原值：先整块读出旧值，合并后一次写回。
+        """
+        existing = self.ws.range((start, col_idx), (end, col_idx)).value
+        if not isinstance(existing, list):
+            existing = [existing]
+
+        merged = []
+        for offset, old_value in enumerate(existing):
+            code = col_a[start - 1 + offset]
+            code_key = str(code).strip() if code is not None else None
+            if code_key in updates:
+                merged.append([updates[code_key][value_index]])
+            else:
+                merged.append([old_value])
+
+        self.ws.range((start, col_idx), (end, col_idx)).value = merged
+
     def save(self):
         """保存Excel文件"""
         try:
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app import LTTB_MAX_POINTS_PER_TRACE, lttb_downsample_indices
+
+
+class LttbDownsampleTests(unittest.TestCase):
+    def test_short_series_is_returned_unchanged(self):
+        dates = pd.date_range("2026-01-01", periods=100, freq="D")
+        values = pd.Series(np.arange(100, dtype=float))
+
+        idx = lttb_downsample_indices(dates, values)
+
+        np.testing.assert_array_equal(idx, np.arange(100))
+
+    def test_long_series_is_reduced_to_target_point_count(self):
+        n = 10000
+        dates = pd.date_range("2015-01-01", periods=n, freq="D")
+        values = pd.Series(np.sin(np.linspace(0, 40, n)))
+
+        idx = lttb_downsample_indices(dates, values, n_out=500)
+
+        self.assertEqual(len(idx), 500)
+        self.assertEqual(idx[0], 0)
+        self.assertEqual(idx[-1], n - 1)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+
+    def test_downsample_preserves_extreme_spike(self):
+        n = LTTB_MAX_POINTS_PER_TRACE * 3
+        dates = pd.date_range("2015-01-01", periods=n, freq="D")
+        values = pd.Series(np.zeros(n))
+        spike_pos = n // 2
+        values.iloc[spike_pos] = 100.0
+
+        idx = lttb_downsample_indices(dates, values)
+
+        self.assertIn(spike_pos, set(idx.tolist()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+from src.data_loader import (
+    _evaluate_simple_formula,
+    _numeric_prefix_sums,
+)
+
+
+def build_grid():
+    """构造带公式的工作表网格（1-based坐标经_grid_cell访问）
+
+    C1=1 D1=2
+    C2=3 D2=4
+    C3=5 D3==SUM(C1:C2)
+    C4==D3*2 D4==C4+D1
+    """
+    return [
+        [None, None, 1.0, 2.0],
+        [None, None, 3.0, 4.0],
+        [None, None, 5.0, '=SUM(C1:C2)'],
+        [None, None, '=D3*2', '=C4+D1'],
+    ]
+
+
+class EvaluateSimpleFormulaTests(unittest.TestCase):
+    def test_sum_range_counts_numeric_cells_only(self):
+        grid = build_grid()
+
+        # C1+C2+C3，C4是公式单元格，SUM与Excel一致只累加数值
+        result = _evaluate_simple_formula(grid, '=SUM(C1:C4)', 5, 3)
+
+        self.assertEqual(result, 9.0)
+
+    def test_sum_with_prefix_sums_matches_fallback(self):
+        grid = build_grid()
+        prefix = _numeric_prefix_sums(grid)
+
+        plain = _evaluate_simple_formula(grid, '=SUM(C1:D2)', 5, 3)
+        fast = _evaluate_simple_formula(grid, '=SUM(C1:D2)', 5, 3,
+                                        sum_prefix=prefix)
+
+        self.assertEqual(plain, 10.0)
+        self.assertEqual(fast, plain)
+
+    def test_sum_range_beyond_grid_is_clamped(self):
+        grid = build_grid()
+        prefix = _numeric_prefix_sums(grid)
+
+        result = _evaluate_simple_formula(grid, '=SUM(C1:C100)', 5, 3,
+                                          sum_prefix=prefix)
+
+        self.assertEqual(result, 9.0)
+
+    def test_cell_reference_arithmetic(self):
+        grid = build_grid()
+
+        result = _evaluate_simple_formula(grid, '=D2-C2', 5, 3)
+
+        self.assertEqual(result, 1.0)
+
+    def test_scaled_sum_like_workbook_formulas(self):
+        grid = build_grid()
+
+        # 生产工作簿中的典型形态：SUM再做换算
+        result = _evaluate_simple_formula(grid, '=SUM(C1:C2)*22000/16000', 5, 3)
+
+        self.assertAlmostEqual(result, 5.5)
+
+    def test_chained_formula_references_resolve_recursively(self):
+        grid = build_grid()
+        memo = {}
+
+        # D4 -> C4 -> D3 -> SUM(C1:C2)
+        result = _evaluate_simple_formula(grid, '=C4+D1', 4, 4, memo=memo)
+
+        self.assertEqual(result, 10.0)
+        # 链上的中间单元格都进了memo，只会求值一次
+        self.assertEqual(memo[(3, 4)], 4.0)
+        self.assertEqual(memo[(4, 3)], 8.0)
+
+    def test_reference_to_empty_or_text_cell_is_zero(self):
+        grid = build_grid()
+
+        self.assertEqual(_evaluate_simple_formula(grid, '=A1+1', 5, 3), 1.0)
+
+    def test_unsupported_expression_returns_none(self):
+        grid = build_grid()
+
+        self.assertIsNone(_evaluate_simple_formula(grid, '=VLOOKUP(C1,C1:D4,2)', 5, 3))
+
+    def test_self_referencing_formula_returns_none(self):
+        grid = [['=A1*2']]
+        memo = {}
+
+        result = _evaluate_simple_formula(grid, '=A1*2', 1, 1, memo=memo)
+
+        self.assertIsNone(result)
+        self.assertIsNone(memo[(1, 1)])
+
+    def test_mutual_cycle_marks_every_cell_in_cycle_none(self):
+        grid = [['=B1+1', '=A1+1']]
+        memo = {}
+
+        result = _evaluate_simple_formula(grid, '=B1+1', 1, 1, memo=memo)
+
+        self.assertIsNone(result)
+        self.assertIsNone(memo[(1, 1)])
+        self.assertIsNone(memo[(1, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()